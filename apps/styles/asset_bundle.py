@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Pack generated assets into one bundle file, and serve them straight from it
+
+Thousands of small PNGs are slow to sync, deploy and stat. A bundle holds
+them all in one file: the encoded assets back to back, then a binary index
+and a fixed-size footer, so a reader opens the file, reads the footer and
+index once, and then serves any asset as a zero-copy memoryview slice of
+an mmap.
+
+    [magic][asset][asset]...[index][footer]
+
+    index   one record per asset: offset, length, sha256, name, content type
+    footer  index offset, index length, asset count, magic
+
+Names are URL paths under public/ (images/products/mug-200x200.png).
+Identical assets are stored once and share an offset.
+
+    python asset_bundle.py build assets.bundle [--kinds avatar placeholder] [--svg]
+    python asset_bundle.py pack assets.bundle public/images
+    python asset_bundle.py list assets.bundle
+    python asset_bundle.py extract assets.bundle [DEST]
+    python asset_bundle.py serve assets.bundle [--port 8080]
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path, PurePath
+
+MAGIC = b"ASSETBN1"
+
+# offset, length, sha256, name length, content type length
+RECORD = struct.Struct("<QQ32sHB")
+# index offset, index length, asset count, magic
+FOOTER = struct.Struct("<QQI8s")
+
+CONTENT_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+    ".svg": "image/svg+xml",
+    ".json": "application/json",
+}
+
+def asset_name(path):
+    """URL path of an output: the part after public/, or the path itself"""
+    parts = PurePath(os.path.normpath(path)).parts
+    if "public" in parts:
+        parts = parts[len(parts) - parts[::-1].index("public"):]
+    return "/".join(p for p in parts if p not in ("/", ".", ".."))
+
+def content_type(name):
+    return CONTENT_TYPES.get(PurePath(name).suffix.lower(), "application/octet-stream")
+
+class BundleWriter:
+    """Append assets to a bundle; the index is written on close()
+
+    Safe to share between threads. The bundle is built beside its path and
+    renamed into place on close, so a server reading the old bundle never
+    sees a partial one. Adding a name twice keeps the last copy.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._tmp = f"{self.path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self._tmp, "wb")
+        self._file.write(MAGIC)
+        self._offset = len(MAGIC)
+        self._entries = {}
+        self._stored = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, data):
+        """Append encoded bytes under name (an output path is reduced to its URL path)"""
+        name = asset_name(name)
+        digest = hashlib.sha256(data).digest()
+        with self._lock:
+            if digest not in self._stored:
+                self._stored[digest] = (self._offset, len(data))
+                self._file.write(data)
+                self._offset += len(data)
+            offset, length = self._stored[digest]
+            self._entries[name] = (offset, length, digest, content_type(name))
+
+    def close(self):
+        with self._lock:
+            index = bytearray()
+            for name, (offset, length, digest, ctype) in sorted(self._entries.items()):
+                encoded_name, encoded_type = name.encode(), ctype.encode()
+                index += RECORD.pack(offset, length, digest, len(encoded_name), len(encoded_type))
+                index += encoded_name + encoded_type
+            self._file.write(index)
+            self._file.write(FOOTER.pack(self._offset, len(index), len(self._entries), MAGIC))
+            self._file.close()
+            os.replace(self._tmp, self.path)
+        return len(self._entries)
+
+    def abort(self):
+        self._file.close()
+        os.remove(self._tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+class Bundle:
+    """Read-only view of a bundle through mmap
+
+    get() returns a memoryview into the mapping, so serving an asset copies
+    nothing until the socket write. Release the views before close().
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if len(self._map) < len(MAGIC) + FOOTER.size or self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not an asset bundle")
+        index_offset, index_length, count, magic = FOOTER.unpack_from(self._map, len(self._map) - FOOTER.size)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} has no index (was the writer closed?)")
+
+        self.entries = {}
+        pos, end = index_offset, index_offset + index_length
+        while pos < end:
+            offset, length, digest, name_length, type_length = RECORD.unpack_from(self._map, pos)
+            pos += RECORD.size
+            name = self._map[pos:pos + name_length].decode()
+            pos += name_length
+            ctype = self._map[pos:pos + type_length].decode()
+            pos += type_length
+            self.entries[name] = (offset, length, digest.hex(), ctype)
+        if len(self.entries) != count:
+            self.close()
+            raise ValueError(f"{self.path}: index lists {len(self.entries)} assets, footer says {count}")
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def names(self):
+        return list(self.entries)
+
+    def get(self, name):
+        """Bytes of one asset as a memoryview of the mapping; KeyError if absent"""
+        offset, length, _, _ = self.entries[name]
+        return self._view[offset:offset + length]
+
+    def info(self, name):
+        """{"bytes", "sha256", "content_type"} of one asset"""
+        _, length, digest, ctype = self.entries[name]
+        return {"bytes": length, "sha256": digest, "content_type": ctype}
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def make_handler(bundle):
+    from http.server import BaseHTTPRequestHandler
+
+    class BundleHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _head(self):
+            name = self.path.split("?", 1)[0].lstrip("/")
+            if name not in bundle:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+            info = bundle.info(name)
+            etag = f'"{info["sha256"]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return None
+            self.send_response(200)
+            self.send_header("Content-Type", info["content_type"])
+            self.send_header("Content-Length", str(info["bytes"]))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return name
+
+        def do_HEAD(self):
+            self._head()
+
+        def do_GET(self):
+            name = self._head()
+            if name is not None:
+                view = bundle.get(name)
+                try:
+                    self.wfile.write(view)
+                finally:
+                    view.release()
+
+        def log_message(self, format, *args):
+            pass
+
+    return BundleHandler
+
+def cmd_build(args):
+    from asset_jobs import build_jobs, run_job
+    from image_manifest import ManifestSet, bundle_outputs
+
+    jobs = build_jobs(args.kinds, svg=args.svg, backdrop_seeds=args.backdrop_seeds)
+    print("=" * 60)
+    print(f"RENDERING {len(jobs)} ASSETS INTO {args.bundle}")
+    print("=" * 60)
+
+    with BundleWriter(args.bundle) as writer, bundle_outputs(writer):
+        manifest = ManifestSet()
+        for job in jobs:
+            run_job(job, manifest)
+        manifest.save()
+    print_summary(args.bundle)
+
+def cmd_pack(args):
+    count = 0
+    with BundleWriter(args.bundle) as writer:
+        for directory in args.directories:
+            for path in sorted(Path(directory).rglob("*")):
+                if path.is_file() and not path.name.startswith("."):
+                    writer.add(str(path), path.read_bytes())
+                    count += 1
+    print(f"✓ Packed {count} files")
+    print_summary(args.bundle)
+
+def print_summary(path):
+    with Bundle(path) as bundle:
+        assets = sum(length for _, length, _, _ in bundle.entries.values())
+    size = os.path.getsize(path)
+    print(f"✓ Wrote bundle: {path} ({len(bundle)} assets, {assets / 1024:.0f} KiB of assets, "
+          f"{size / 1024:.0f} KiB on disk)")
+
+def cmd_list(args):
+    with Bundle(args.bundle) as bundle:
+        for name in bundle.names():
+            info = bundle.info(name)
+            print(f"{info['bytes']:>10}  {info['content_type']:<16}  {info['sha256'][:12]}  {name}")
+        print(f"\n{len(bundle)} asset(s)")
+
+def cmd_extract(args):
+    with Bundle(args.bundle) as bundle:
+        for name in bundle.names():
+            output = Path(args.dest) / name
+            output.parent.mkdir(parents=True, exist_ok=True)
+            view = bundle.get(name)
+            with open(output, "wb") as f:
+                f.write(view)
+            view.release()
+        print(f"✓ Extracted {len(bundle)} asset(s) to {args.dest}")
+
+def cmd_serve(args):
+    from http.server import ThreadingHTTPServer
+
+    with Bundle(args.bundle) as bundle:
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(bundle))
+        server.daemon_threads = True
+        print(f"Serving {len(bundle)} assets from {args.bundle} on http://{args.host}:{server.server_port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+def build_parser():
+    from asset_jobs import JOB_KINDS
+
+    parser = argparse.ArgumentParser(description="Pack generated assets into a single bundle and serve from it")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("build", help="render assets straight into a bundle")
+    p.add_argument("bundle")
+    p.add_argument("--kinds", nargs="+", choices=JOB_KINDS + ["product"],
+                   default=["avatar", "placeholder", "portfolio", "feature"],
+                   help="what to render (default: everything but the backdrop and Gemini photos)")
+    p.add_argument("--svg", action="store_true", help="SVG avatars, placeholders and features")
+    p.add_argument("--backdrop-seeds", nargs="+", type=int, default=[42])
+    p.set_defaults(func=cmd_build)
+
+    p = sub.add_parser("pack", help="bundle files already on disk")
+    p.add_argument("bundle")
+    p.add_argument("directories", nargs="+")
+    p.set_defaults(func=cmd_pack)
+
+    p = sub.add_parser("list", help="assets in a bundle")
+    p.add_argument("bundle")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("extract", help="write every asset back out as a file")
+    p.add_argument("bundle")
+    p.add_argument("dest", nargs="?", default="public")
+    p.set_defaults(func=cmd_extract)
+
+    p = sub.add_parser("serve", help="HTTP server answering from the bundle's mmap")
+    p.add_argument("bundle")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.set_defaults(func=cmd_serve)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Assets the generators produce, and where they are written
+
+Plain data with no imports at all, so job listings
+and dry runs never pay for Pillow or the Gemini client.
+"""
+
+PRODUCTS_DIR = "public/images/products"
+AVATARS_DIR = "public/images/avatars"
+PORTFOLIO_DIR = "public/images/portfolio"
+FEATURES_DIR = "public/images/features"
+
+# Silly products with creative prompts for the Gemini generator
+SILLY_PRODUCTS = [
+    {
+        "name": "self-aware-toaster",
+        "sizes": ["300x300", "600x600"],
+        "prompt": "A retro chrome toaster with an LCD screen displaying judgemental facial expressions and emojis, glowing RGB LED buttons on the side, sitting on a modern kitchen counter, product photography, 4K, professional lighting, slightly humorous but high-quality commercial product photo"
+    },
+    {
+        "name": "invisible-socks",
+        "sizes": ["300x300", "600x600"],
+        "prompt": "An empty open sock package with a label reading 'Invisible Socks', with slight shimmer effects in the air where socks would be, professional product photography on white background, humorous commercial product photo, 4K quality"
+    },
+    {
+        "name": "telepathic-remote",
+        "sizes": ["300x300", "600x600"],
+        "prompt": "A futuristic TV remote with glowing brain wave sensors, holographic display showing thought patterns, metallic silver and blue color scheme, floating slightly above surface, professional product photography, 4K, sci-fi aesthetic but commercial quality"
+    },
+    {
+        "name": "self-folding-basket",
+        "sizes": ["300x300", "600x600"],
+        "prompt": "A high-tech laundry basket with robotic arms inside, LED indicators, sleek modern design with chrome and white plastic, clothes being automatically folded by mechanical arms, professional product photography, 4K, futuristic home appliance"
+    },
+    {
+        "name": "procrastination-timer",
+        "sizes": ["300x300", "600x600"],
+        "prompt": "A quirky digital timer device with a snooze button that takes up 80% of the surface, tiny start button, display showing 'Maybe Later', retro-futuristic design, sitting on a desk, professional product photography, humorous but commercial quality, 4K"
+    },
+]
+
+# Additional regular products for e-commerce templates
+REGULAR_PRODUCTS = [
+    {
+        "name": "wireless-headphones",
+        "sizes": ["150x150", "200x200", "400x400"],
+        "prompt": "Premium over-ear wireless headphones in matte black with rose gold accents, soft leather cushions, modern minimalist design, professional product photography on white background, 4K quality"
+    },
+    {
+        "name": "mechanical-keyboard",
+        "sizes": ["150x150", "200x200", "400x400"],
+        "prompt": "RGB mechanical gaming keyboard with colorful backlighting, floating keycaps design, black aluminum frame, professional product photography on white background, 4K quality"
+    },
+    {
+        "name": "ergonomic-mouse",
+        "sizes": ["150x150", "200x200", "400x400"],
+        "prompt": "Wireless ergonomic vertical mouse in matte black, modern design with blue LED accents, professional product photography on white background, 4K quality"
+    },
+    {
+        "name": "usb-c-hub",
+        "sizes": ["200x200"],
+        "prompt": "Sleek 7-in-1 USB-C hub with multiple ports visible, aluminum body in space gray, professional product photography on white background, 4K quality"
+    },
+    {
+        "name": "monitor-stand",
+        "sizes": ["200x200"],
+        "prompt": "Adjustable monitor stand in black aluminum with sleek modern design, showing multiple height adjustment levels, professional product photography on white background, 4K quality"
+    },
+    {
+        "name": "desk-mat",
+        "sizes": ["200x200"],
+        "prompt": "XXL desk mat with geometric dark pattern, extended mouse pad surface, rolled at one corner to show thickness, professional product photography, 4K quality"
+    },
+    {
+        "name": "cable-kit",
+        "sizes": ["200x200"],
+        "prompt": "Cable management kit with various clips, ties, and organizers arranged neatly, black and gray colors, professional product photography on white background, 4K quality"
+    },
+]
+
+# Avatars with different initials and sizes
+AVATARS = [
+    ("AT", "32x32"), ("AT", "40x40"), ("AT", "128x128"), ("AT", "150x150"),
+    ("SC", "32x32"), ("SC", "40x40"),
+    ("MJ", "32x32"), ("MJ", "40x40"),
+    ("ED", "32x32"), ("ED", "40x40"),
+    ("JS", "32x32"), ("JS", "40x40"),
+    ("SM", "40x40"), ("DC", "40x40"), ("ER", "40x40"),
+    ("MT", "40x40"), ("LA", "40x40"), ("JW", "40x40"),
+]
+
+# Portfolio images with different themes
+PORTFOLIO_PROJECTS = [
+    ("E-Commerce Platform", "800x600", "web"),
+    ("Mobile Banking App", "800x600", "mobile"),
+    ("Data Dashboard", "800x600", "data"),
+    ("Design System", "800x600", "design"),
+    ("AI Chatbot", "800x600", "ai"),
+    ("Portfolio Site", "800x600", "code"),
+    ("Featured Project", "600x400", "web"),
+    ("Side Project", "600x400", "code"),
+    ("Case Study", "400x300", "design"),
+    ("Recent Work", "400x300", "web"),
+    ("Featured Work", "1200x600", "web"),
+    ("Main Project", "800x500", "code"),
+]
+
+# Feature images
+FEATURES = [
+    "Fast Performance",
+    "Secure by Default",
+    "Easy to Use",
+    "24/7 Support",
+    "Cloud Sync",
+    "Mobile Ready",
+]
+
+def size_area(size):
+    width, height = map(int, size.split('x'))
+    return width * height
+
+def product_outputs(name, sizes, svg=False):
+    """(size, output_path) pairs for a product: one PNG per size, or a single SVG laid out at the largest"""
+    if svg:
+        return [(max(sizes, key=size_area), f"{PRODUCTS_DIR}/{name}.svg")]
+    return [(size, f"{PRODUCTS_DIR}/{name}-{size}.png") for size in sizes]
+
+def avatar_outputs(svg=False):
+    """(initials, size, output_path) for every avatar; with svg, one file per person at their largest size"""
+    if not svg:
+        return [(initials, size, f"{AVATARS_DIR}/{initials.lower()}-{size}.png") for initials, size in AVATARS]
+
+    largest = {}
+    for initials, size in AVATARS:
+        if initials not in largest or size_area(size) > size_area(largest[initials]):
+            largest[initials] = size
+    return [(initials, size, f"{AVATARS_DIR}/{initials.lower()}.svg") for initials, size in largest.items()]
+
+def avatar_hue(initials):
+    """Consistent hue in [0, 1) for a person; unlike hash(), the same in every process"""
+    h = 0
+    for c in initials:
+        h = (h * 31 + ord(c)) % 1000003
+    return h % 100 / 100
+
+def portfolio_output(title, size):
+    filename = title.lower().replace(' ', '-')
+    return f"{PORTFOLIO_DIR}/{filename}-{size}.png"
+
+def feature_output(feature, svg=False):
+    filename = feature.lower().replace(' ', '-').replace('/', '-')
+    return f"{FEATURES_DIR}/{filename}.svg" if svg else f"{FEATURES_DIR}/{filename}-600x400.png"
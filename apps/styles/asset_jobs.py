@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Asset jobs shared by the batch runners
+
+A job is a plain JSON-serializable dict so it can cross process (and host)
+boundaries: {"kind": ..., "output": ..., "args": [...]}. The generator
+modules are only imported when a job actually runs.
+"""
+import importlib.util
+import os
+from pathlib import Path
+
+from asset_catalog import (SILLY_PRODUCTS, REGULAR_PRODUCTS, PORTFOLIO_PROJECTS, FEATURES,
+                           product_outputs, avatar_outputs, avatar_hue, portfolio_output, feature_output)
+
+BACKDROP_SCRIPT = Path(__file__).resolve().parent.parent / "useless/public/backdrop-art/generate_backdrop_final.py"
+BACKDROP_OUTPUT = str(BACKDROP_SCRIPT.parent / "useless-glitch-backdrop.png")
+
+JOB_KINDS = ["avatar", "placeholder", "portfolio", "feature", "backdrop"]
+
+def load_backdrop():
+    """Import the backdrop script, which lives outside this app"""
+    spec = importlib.util.spec_from_file_location("generate_backdrop_final", BACKDROP_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def backdrop_output(seed):
+    """The canonical still for seed 42, a numbered variant for any other seed"""
+    if seed == 42:
+        return BACKDROP_OUTPUT
+    return BACKDROP_OUTPUT[:-len(".png")] + f"-{seed}.png"
+
+def job_size(job):
+    """Canvas (width, height) a job renders"""
+    if job["kind"] == "backdrop":
+        return 1920, 1080
+    size = job["args"][1]
+    return tuple(map(int, size.split('x')))
+
+def build_jobs(kinds=None, svg=False, backdrop_seeds=(42,)):
+    """Every job the generator scripts produce, in the order their main() runs them
+
+    "product" (Gemini images) is never included unless asked for by name.
+    Each extra backdrop seed adds a variant still.
+    """
+    kinds = kinds or JOB_KINDS
+    jobs = []
+
+    for products, palette in ((SILLY_PRODUCTS, "silly"), (REGULAR_PRODUCTS, "tech")):
+        for product in products:
+            name = product["name"]
+            if "placeholder" in kinds:
+                for size, output in product_outputs(name, product["sizes"], svg):
+                    jobs.append({"kind": "placeholder", "output": output, "args": [name, size, palette]})
+            if "product" in kinds:
+                for size, output in product_outputs(name, product["sizes"]):
+                    jobs.append({"kind": "product", "output": output, "args": [product["prompt"], size]})
+
+    if "avatar" in kinds:
+        for initials, size, output in avatar_outputs(svg):
+            jobs.append({"kind": "avatar", "output": output, "args": [initials, size, avatar_hue(initials)]})
+
+    if "portfolio" in kinds:
+        for title, size, theme in PORTFOLIO_PROJECTS:
+            jobs.append({"kind": "portfolio", "output": portfolio_output(title, size), "args": [title, size, theme]})
+
+    if "feature" in kinds:
+        for feature in FEATURES:
+            jobs.append({"kind": "feature", "output": feature_output(feature, svg), "args": [feature, "600x400"]})
+
+    if "backdrop" in kinds:
+        for seed in backdrop_seeds:
+            jobs.append({"kind": "backdrop", "output": backdrop_output(seed), "args": [seed]})
+
+    return jobs
+
+def run_job(job, manifest=None):
+    """Render a single job to its output path, recording it in manifest if given"""
+    from image_manifest import active_bundle
+
+    kind, output, args = job["kind"], job["output"], job["args"]
+    bundle = active_bundle()
+    if bundle is None:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+
+    if kind == "placeholder":
+        from generate_placeholders import generate_placeholder
+        name, size, palette = args
+        generate_placeholder(name, size, output, palette_type=palette, manifest=manifest)
+    elif kind == "avatar":
+        from generate_avatars_and_more import generate_avatar
+        initials, size, hue = args
+        generate_avatar(initials, size, output, hue, manifest)
+    elif kind == "portfolio":
+        from generate_avatars_and_more import generate_portfolio_image
+        title, size, theme = args
+        generate_portfolio_image(title, size, output, theme, manifest)
+    elif kind == "feature":
+        from generate_avatars_and_more import generate_feature_image
+        title, size = args
+        generate_feature_image(title, size, output, manifest)
+    elif kind == "product":
+        from generate_silly_products import generate_image
+        prompt, size = args
+        if not generate_image(prompt, size, output, manifest):
+            raise RuntimeError(f"Gemini returned no image for {output}")
+    elif kind == "backdrop":
+        # The script saves straight to its path; render beside it and rename into place
+        tmp = f"{output}.{os.getpid()}.tmp"
+        load_backdrop().main(tmp, seed=args[0])
+        if bundle is None:
+            os.replace(tmp, output)
+        else:
+            bundle.add(output, Path(tmp).read_bytes())
+            os.remove(tmp)
+    else:
+        raise ValueError(f"Unknown job kind: {kind}")
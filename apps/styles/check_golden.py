@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Golden-image regression check for the generators
+
+Renders each generator with a fixed seed and compares it to the stored
+golden PNG in golden/. An asset passes when its largest per-channel error
+and its structural similarity are both within that asset's tolerance.
+Failures write expected | actual | heatmap strips to golden/diff/.
+
+Text is drawn with Pillow's bundled font during the check (see
+render_cache.pinned_fonts), so the goldens do not depend on which fonts
+the machine has installed.
+
+Usage:
+    python check_golden.py            # compare everything
+    python check_golden.py --update   # rewrite the goldens
+    python check_golden.py avatar-at-128 backdrop-base
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+DIFF_DIR = GOLDEN_DIR / "diff"
+
+SEED = 1234
+
+def _avatar(initials, size, hue):
+    from generate_avatars_and_more import render_avatar
+    return lambda: render_avatar(initials, size, hue)
+
+def _placeholder(name, size, palette):
+    from generate_placeholders import render_placeholder
+    return lambda: render_placeholder(name, size, palette)
+
+def _gradient(width, height, color1, color2):
+    from generate_placeholders import create_gradient_image
+    return lambda: create_gradient_image(width, height, color1, color2)
+
+def _portfolio(title, size, theme):
+    from generate_avatars_and_more import render_portfolio_image
+    return lambda: render_portfolio_image(title, size, theme)
+
+def _feature(title, size):
+    from generate_avatars_and_more import render_feature_image
+    return lambda: render_feature_image(title, size)
+
+def _backdrop_base():
+    from asset_jobs import load_backdrop
+    return load_backdrop().create_base
+
+def _backdrop_vignette():
+    from asset_jobs import load_backdrop
+    backdrop = load_backdrop()
+    # A flat canvas isolates the falloff from everything layered underneath it
+    return lambda: backdrop.vignette(Image.new('RGB', (backdrop.WIDTH, backdrop.HEIGHT), (160, 160, 160)),
+                                     strength=0.32)
+
+# name -> (renderer factory, args, max per-channel error, min structural similarity)
+CASES = {
+    "avatar-at-128": (_avatar, ("AT", "128x128", 0.55), 2, 0.99),
+    "avatar-sc-40": (_avatar, ("SC", "40x40", 0.15), 2, 0.98),
+    "gradient-300x200": (_gradient, (300, 200, "#667eea", "#764ba2"), 1, 0.99),
+    "placeholder-silly-600": (_placeholder, ("self-aware-toaster", "600x600", "silly"), 2, 0.99),
+    "placeholder-tech-200": (_placeholder, ("usb-c-hub", "200x200", "tech"), 2, 0.99),
+    "portfolio-web-800x600": (_portfolio, ("E-Commerce Platform", "800x600", "web"), 2, 0.99),
+    "feature-600x400": (_feature, ("Fast Performance", "600x400"), 2, 0.99),
+    "backdrop-base": (_backdrop_base, (), 2, 0.98),
+    "backdrop-vignette": (_backdrop_vignette, (), 1, 0.99),
+}
+
+def _window_mean(a, k=8):
+    """Mean of every k x k window, via a summed-area table"""
+    s = np.pad(a, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    return (s[k:, k:] - s[:-k, k:] - s[k:, :-k] + s[:-k, :-k]) / (k * k)
+
+def structural_similarity(a, b, k=8):
+    """Mean SSIM of two single-channel float arrays over k x k windows"""
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    k = min(k, *a.shape)
+    mu_a, mu_b = _window_mean(a, k), _window_mean(b, k)
+    var_a = _window_mean(a * a, k) - mu_a ** 2
+    var_b = _window_mean(b * b, k) - mu_b ** 2
+    cov = _window_mean(a * b, k) - mu_a * mu_b
+    ssim = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(ssim.mean())
+
+def compare(expected, actual):
+    """(max per-channel error, worst per-channel SSIM, per-pixel error map)"""
+    a = np.asarray(expected, dtype=np.float64)
+    b = np.asarray(actual, dtype=np.float64)
+    if a.ndim == 2:
+        a, b = a[..., None], b[..., None]
+    diff = np.abs(a - b)
+    max_error = int(diff.max())
+    ssim = min(structural_similarity(a[..., c], b[..., c]) for c in range(a.shape[2]))
+    return max_error, ssim, diff.max(axis=2)
+
+def write_heatmap(name, expected, actual, error):
+    """Save expected | actual | heatmap side by side"""
+    DIFF_DIR.mkdir(parents=True, exist_ok=True)
+    heat = np.clip(error * 8, 0, 255)
+    rgb = np.stack([heat, np.clip(heat * 2 - 255, 0, 255), np.zeros_like(heat)], axis=2).astype(np.uint8)
+    heatmap = Image.fromarray(rgb, 'RGB')
+
+    w, h = expected.size
+    strip = Image.new('RGB', (w * 3, h))
+    strip.paste(expected.convert('RGB'), (0, 0))
+    strip.paste(actual.convert('RGB'), (w, 0))
+    strip.paste(heatmap, (w * 2, 0))
+    path = DIFF_DIR / f"{name}.png"
+    strip.save(path, 'PNG')
+    return path
+
+def render(name):
+    from render_cache import pinned_fonts
+
+    factory, args, _, _ = CASES[name]
+    fn = factory(*args)
+    random.seed(SEED)
+    with pinned_fonts():
+        return fn()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare generator output against golden images")
+    parser.add_argument("names", nargs="*", help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--update", action="store_true", help="write the current output as the new goldens")
+    args = parser.parse_args()
+
+    names = args.names or list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    GOLDEN_DIR.mkdir(exist_ok=True)
+    failures = 0
+
+    for name in names:
+        start = time.perf_counter()
+        actual = render(name)
+        elapsed = time.perf_counter() - start
+        golden_path = GOLDEN_DIR / f"{name}.png"
+
+        if args.update:
+            actual.save(golden_path, 'PNG')
+            print(f"✓ Updated {golden_path.name} ({elapsed:.2f}s)")
+            continue
+
+        if not golden_path.exists():
+            print(f"✗ {name}: no golden image (run with --update)")
+            failures += 1
+            continue
+
+        expected = Image.open(golden_path)
+        if expected.mode != actual.mode or expected.size != actual.size:
+            print(f"✗ {name}: expected {expected.mode} {expected.size}, got {actual.mode} {actual.size}")
+            failures += 1
+            continue
+
+        _, _, max_allowed, min_ssim = CASES[name]
+        max_error, ssim, error = compare(expected, actual)
+        if max_error <= max_allowed and ssim >= min_ssim:
+            print(f"✓ {name}: max error {max_error}, ssim {ssim:.4f} ({elapsed:.2f}s)")
+        else:
+            path = write_heatmap(name, expected, actual, error)
+            print(f"✗ {name}: max error {max_error} (≤{max_allowed}), ssim {ssim:.4f} (≥{min_ssim}) -> {path}")
+            failures += 1
+
+    if failures:
+        print(f"\n{failures} of {len(names)} golden checks failed")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
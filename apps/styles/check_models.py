@@ -1,28 +1,165 @@
 #!/usr/bin/env python3
-"""Check available Gemini models"""
+"""Check available Gemini models, or probe image models for latency
+
+    python check_models.py            # list the models your key can see
+    python check_models.py --probe    # time each candidate and rank them
+
+The probe sends a small fixed prompt to each candidate several times. The
+first call is the cold latency; the rest give the warm median. Results go
+to model-probe.json, ranked fastest first, and generate_silly_products.py
+uses the top-ranked model as its default.
+"""
+import argparse
+import json
 import os
-from google import genai
-from dotenv import load_dotenv
+import statistics
+import time
+from pathlib import Path
+
+PROBE_RESULTS = Path(__file__).resolve().parent / "model-probe.json"
+
+PROBE_PROMPT = "A plain white coffee mug on a white background, minimal product photo"
+
+# Image-capable models worth comparing
+PROBE_CANDIDATES = [
+    "imagen-4.0-fast-generate-001",
+    "imagen-4.0-generate-001",
+    "gemini-2.5-flash-image",
+    "gemini-2.0-flash-preview-image-generation",
+]
+
+def list_models():
+    from google import genai
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        print("No API key found!")
+        exit(1)
+
+    client = genai.Client(api_key=api_key)
+
+    print("Fetching available models...")
+    try:
+        models = client.models.list()
+        print(f"\nAvailable models ({len(list(models))} total):\n")
+        for model in models:
+            print(f"- {model.name}")
+            if hasattr(model, 'supported_generation_methods'):
+                print(f"  Methods: {model.supported_generation_methods}")
+            if hasattr(model, 'description'):
+                print(f"  Description: {model.description[:100]}...")
+            print()
+    except Exception as e:
+        print(f"Error: {e}")
 
-load_dotenv()
+def probe_model(client, model, runs):
+    """Time `runs` identical requests to one model"""
+    from google.genai import types
+    from gemini_telemetry import classify_error
 
-api_key = os.getenv('GEMINI_API_KEY')
-if not api_key:
-    print("No API key found!")
-    exit(1)
+    latencies = [None] * runs  # seconds per attempt; None where it failed
+    image_bytes = []
+    errors = {}
+    for attempt in range(runs):
+        start = time.perf_counter()
+        try:
+            response = client.models.generate_content(
+                model=model,
+                contents=PROBE_PROMPT,
+                config=types.GenerateContentConfig(response_modalities=['image']),
+            )
+        except Exception as e:
+            category = classify_error(e)
+            errors[category] = errors.get(category, 0) + 1
+            continue
+        elapsed = time.perf_counter() - start
 
-client = genai.Client(api_key=api_key)
+        candidates = response.candidates or []
+        parts = candidates[0].content.parts if candidates and candidates[0].content else None
+        data = next((p.inline_data.data for p in parts or [] if p.inline_data), None)
+        if data is None:
+            errors["no_image"] = errors.get("no_image", 0) + 1
+            continue
+        latencies[attempt] = elapsed
+        image_bytes.append(len(data))
 
-print("Fetching available models...")
-try:
-    models = client.models.list()
-    print(f"\nAvailable models ({len(list(models))} total):\n")
+    # The first attempt is the cold one whether or not it succeeded; later ones are warm
+    cold = latencies[0] if runs else None
+    warm = [t for t in latencies[1:] if t is not None]
+    ok = sum(t is not None for t in latencies)
+    return {
+        "model": model,
+        "ok": ok,
+        "runs": runs,
+        "cold_seconds": cold,
+        "warm_p50_seconds": statistics.median(warm) if warm else None,
+        "warm_min_seconds": min(warm) if warm else None,
+        "image_bytes": round(statistics.mean(image_bytes)) if image_bytes else None,
+        "errors": errors,
+    }
+
+def rank(results):
+    """Models that answered every run first, fastest warm median (then cold) first"""
+    def key(r):
+        reliable = r["ok"] == r["runs"]
+        speed = r["warm_p50_seconds"] if r["warm_p50_seconds"] is not None else r["cold_seconds"]
+        return (not reliable, speed is None, speed or 0, r["cold_seconds"] or 0)
+    return sorted(results, key=key)
+
+def probe(models=None, runs=3, output=PROBE_RESULTS):
+    from generate_silly_products import get_client
+
+    models = models or PROBE_CANDIDATES
+    client = get_client()
+
+    print("=" * 60)
+    print(f"PROBING {len(models)} MODELS ({runs} runs each)")
+    print("=" * 60)
+
+    results = []
     for model in models:
-        print(f"- {model.name}")
-        if hasattr(model, 'supported_generation_methods'):
-            print(f"  Methods: {model.supported_generation_methods}")
-        if hasattr(model, 'description'):
-            print(f"  Description: {model.description[:100]}...")
-        print()
-except Exception as e:
-    print(f"Error: {e}")
+        result = probe_model(client, model, runs)
+        results.append(result)
+        if result["ok"]:
+            warm = result["warm_p50_seconds"]
+            warm_text = f"warm p50 {warm:.2f}s" if warm is not None else "no warm runs"
+            cold = result["cold_seconds"]
+            cold_text = f"cold {cold:.2f}s" if cold is not None else "cold run failed"
+            print(f"✓ {model}: {cold_text}, {warm_text}, "
+                  f"{result['image_bytes'] / 1024:.0f} KiB, {result['ok']}/{runs} ok")
+        else:
+            print(f"✗ {model}: no image in {runs} runs ({result['errors']})")
+
+    ranked = rank(results)
+    usable = [r for r in ranked if r["ok"]]
+    report = {
+        "probed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "prompt": PROBE_PROMPT,
+        "runs": runs,
+        "fastest": usable[0]["model"] if usable else None,
+        "results": ranked,
+    }
+    Path(output).write_text(json.dumps(report, indent=2) + "\n")
+
+    print(f"\nFastest: {report['fastest'] or 'none'}")
+    print(f"✓ Wrote ranking: {output}")
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List Gemini models, or probe image models for latency")
+    parser.add_argument("--probe", action="store_true", help="time each candidate model and rank them")
+    parser.add_argument("--models", nargs="+", help=f"models to probe (default: {', '.join(PROBE_CANDIDATES)})")
+    parser.add_argument("--runs", type=int, default=3, help="requests per model; the first is the cold one (default: 3)")
+    parser.add_argument("--output", default=str(PROBE_RESULTS), help="where to write the ranking")
+    args = parser.parse_args(argv)
+
+    if args.probe:
+        probe(args.models, runs=args.runs, output=args.output)
+    else:
+        list_models()
+
+if __name__ == "__main__":
+    main()
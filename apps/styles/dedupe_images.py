@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Index generated images by content and perceptual hash, and report duplicates
+
+Every image under the given directories gets a sha256 of its bytes and a
+64-bit DCT perceptual hash. The DCTs for all new or modified images are
+computed together as one batched matrix product, and results are kept in
+an index file so later runs only decode what changed.
+
+Exact duplicates share a sha256; near duplicates (the same placeholder at
+two sizes, a re-run with a different random palette) are pairs whose
+perceptual hashes differ in at most --threshold bits. With --hardlink,
+every exact duplicate is replaced by a hardlink to the first copy. Paths
+that are already hardlinks of one another count as a single file, so a
+later run no longer reports them.
+
+Usage: python dedupe_images.py [public/images ...] [--threshold 6] [--hardlink]
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+INDEX_FILE = ".image-index.json"
+INDEX_VERSION = 1
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
+
+# Images are reduced to HASH_SAMPLE x HASH_SAMPLE grey before the DCT,
+# and the lowest HASH_BITS x HASH_BITS frequencies form the hash
+HASH_SAMPLE = 32
+HASH_BITS = 8
+
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    return np.cos(np.pi * (2 * x + 1) * k / (2 * n))
+
+def _grey_sample(data):
+    """HASH_SAMPLE x HASH_SAMPLE greyscale array of encoded image bytes, alpha flattened onto white"""
+    img = Image.open(io.BytesIO(data))
+    img.draft('RGB', (HASH_SAMPLE * 2, HASH_SAMPLE * 2))
+    if img.mode in ('RGBA', 'LA', 'P'):
+        img = img.convert('RGBA')
+        flat = Image.new('RGB', img.size, 'white')
+        flat.paste(img, mask=img.getchannel('A'))
+        img = flat
+    img = img.convert('L').resize((HASH_SAMPLE, HASH_SAMPLE), Image.LANCZOS)
+    return np.asarray(img, dtype=np.float64)
+
+def perceptual_hashes(samples):
+    """64-bit pHash of each (HASH_SAMPLE, HASH_SAMPLE) sample, for a whole stack at once"""
+    d = _dct_matrix(HASH_SAMPLE)[:HASH_BITS]
+    low = np.einsum('ky,nyx,jx->nkj', d, samples, d).reshape(len(samples), -1)
+    # The DC term only carries overall brightness, so keep it out of the median
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    bits = np.packbits(low > median, axis=1)
+    return bits.view('>u8').ravel()
+
+def find_images(dirs):
+    for directory in dirs:
+        for path in sorted(Path(directory).rglob("*")):
+            if path.suffix.lower() in IMAGE_EXTENSIONS and path.is_file():
+                yield path
+
+def load_index(path):
+    if path.exists():
+        index = json.loads(path.read_text())
+        if index.get("version") == INDEX_VERSION:
+            return index["images"]
+    return {}
+
+def save_index(path, images):
+    path.write_text(json.dumps({"version": INDEX_VERSION, "images": images}, indent=2, sort_keys=True) + "\n")
+
+def update_index(dirs, images):
+    """Bring the index entries up to date with the files on disk; returns how many were (re)hashed"""
+    current = {}
+    stale = []
+    for path in find_images(dirs):
+        key = path.as_posix()
+        st = path.stat()
+        entry = images.get(key)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["bytes"] == st.st_size:
+            # Linking a path changes its inode but can keep its mtime and size
+            entry["inode"] = [st.st_dev, st.st_ino]
+            current[key] = entry
+        else:
+            stale.append((key, path, st))
+
+    keys, samples = [], []
+    for key, path, st in stale:
+        data = path.read_bytes()
+        try:
+            samples.append(_grey_sample(data))
+        except OSError as e:
+            print(f"✗ Skipping {key}: {e}")
+            continue
+        keys.append(key)
+        current[key] = {
+            "bytes": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "inode": [st.st_dev, st.st_ino],
+        }
+
+    if samples:
+        for key, phash in zip(keys, perceptual_hashes(np.stack(samples))):
+            current[key]["phash"] = f"{int(phash):016x}"
+
+    images.clear()
+    images.update(current)
+    return len(keys)
+
+def exact_duplicates(images, links=False):
+    """Groups of paths with identical bytes stored in more than one file, first path first
+
+    Paths hardlinked to an earlier path in the group are left out, unless
+    links is set (hardlink_duplicates needs them all to finish a group).
+    """
+    groups = {}
+    for key in sorted(images):
+        inode = tuple(images[key]["inode"])
+        groups.setdefault(images[key]["sha256"], {}).setdefault(inode, []).append(key)
+    if links:
+        return [sum(files.values(), []) for files in groups.values() if len(files) > 1]
+    return [[keys[0] for keys in files.values()] for files in groups.values() if len(files) > 1]
+
+def near_duplicates(images, threshold, chunk=1024):
+    """(path, path, distance) for distinct images whose pHashes are within threshold bits"""
+    keys = sorted(images)
+    hashes = np.array([int(images[k]["phash"], 16) for k in keys], dtype=np.uint64)
+    shas = [images[k]["sha256"] for k in keys]
+    pairs = []
+    for start in range(0, len(keys), chunk):
+        block = hashes[start:start + chunk]
+        distances = np.bitwise_count(block[:, None] ^ hashes[None, :])
+        for i, j in zip(*np.nonzero(distances <= threshold)):
+            a, b = start + i, j
+            if a < b and shas[a] != shas[b]:
+                pairs.append((keys[a], keys[b], int(distances[i, j])))
+    return pairs
+
+def hardlink_duplicates(groups):
+    """Replace every copy after the first with a hardlink to it; returns bytes freed"""
+    freed = 0
+    for keep, *copies in groups:
+        for copy in copies:
+            if os.path.samefile(keep, copy):
+                continue
+            tmp = f"{copy}.link-tmp"
+            try:
+                # Space only comes back once the last link to the old file goes
+                last_link = os.stat(copy).st_nlink == 1
+                os.link(keep, tmp)
+                os.replace(tmp, copy)
+            except OSError as e:
+                print(f"✗ Could not link {copy}: {e}")
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                continue
+            if last_link:
+                freed += os.path.getsize(keep)
+            print(f"✓ Linked {copy} -> {keep}")
+    return freed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find duplicate and near-duplicate generated images")
+    parser.add_argument("dirs", nargs="*", default=["public/images"], help="directories to scan (default: public/images)")
+    parser.add_argument("--index", default=INDEX_FILE, help=f"index file (default: {INDEX_FILE})")
+    parser.add_argument("--threshold", type=int, default=6, help="max differing pHash bits for a near duplicate (default: 6)")
+    parser.add_argument("--hardlink", action="store_true", help="replace exact duplicates with hardlinks")
+    args = parser.parse_args(argv)
+
+    index_path = Path(args.index)
+    images = load_index(index_path)
+    hashed = update_index(args.dirs, images)
+    save_index(index_path, images)
+
+    print("=" * 60)
+    print(f"INDEXED {len(images)} IMAGES ({hashed} hashed, {len(images) - hashed} unchanged)")
+    print("=" * 60)
+
+    groups = exact_duplicates(images)
+    redundant = sum(images[k]["bytes"] for keys in groups for k in keys[1:])
+    print(f"\nExact duplicates: {len(groups)} group(s), {redundant / 1024:.1f} KiB redundant")
+    for keys in groups:
+        print(f"  {keys[0]}")
+        for key in keys[1:]:
+            print(f"    = {key}")
+
+    pairs = near_duplicates(images, args.threshold)
+    print(f"\nNear duplicates (≤{args.threshold} bits): {len(pairs)} pair(s)")
+    for a, b, distance in pairs:
+        print(f"  {a} ~ {b} ({distance} bits)")
+
+    if args.hardlink and groups:
+        print()
+        freed = hardlink_duplicates(exact_duplicates(images, links=True))
+        # Linked paths now carry the kept file's mtime
+        update_index(args.dirs, images)
+        save_index(index_path, images)
+        print(f"\nFreed {freed / 1024:.1f} KiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Gemini API, for exercising the product generator offline
+
+Answers POST /v1beta/models/{model}:generateContent with a PNG after a
+configurable delay (overridable per model, with an extra delay on each
+model's first request), and fails a configurable share of requests, so
+retries, telemetry, concurrency and model probing can be checked without
+an API key. GET /stats returns how many TCP connections and requests it
+has seen, which shows whether clients reuse kept-alive connections.
+
+    python gemini_stub.py --delay 0.3 --fail-rate 0.1 &
+    python gemini_stub.py --model-delay imagen-4.0-fast-generate-001=0.5 --cold-delay 1 &
+    GEMINI_API_KEY=stub GEMINI_BASE_URL=http://127.0.0.1:8765 python generate_silly_products.py
+"""
+import argparse
+import base64
+import json
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+GENERATE_PATH = re.compile(r"^/v1beta/models/([^/:]+):generateContent$")
+
+STATUS_NAMES = {429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE", 400: "INVALID_ARGUMENT"}
+
+def noise_png(size, seed=0):
+    """RGB PNG of random pixels, so its encoded size is close to 3 * size * size bytes"""
+    rng = random.Random(seed)
+    raw = b"".join(b"\x00" + rng.randbytes(size * 3) for _ in range(size))
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b"")
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        # One handler per TCP connection; keep-alive requests reuse it
+        super().setup()
+        with self.server.lock:
+            self.server.stats["connections"] += 1
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/stats":
+            return self._send_json(404, {"error": {"code": 404, "message": f"No route for {self.path}", "status": "NOT_FOUND"}})
+        with self.server.lock:
+            stats = dict(self.server.stats)
+        self._send_json(200, stats)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        with self.server.lock:
+            self.server.stats["requests"] += 1
+
+        match = GENERATE_PATH.match(self.path.split("?", 1)[0])
+        if not match:
+            return self._send_json(404, {"error": {"code": 404, "message": f"No route for {self.path}", "status": "NOT_FOUND"}})
+
+        config = self.server.config
+        model = match.group(1)
+        if model in config.missing_model:
+            return self._send_json(404, {"error": {"code": 404, "message": f"models/{model} is not found",
+                                                   "status": "NOT_FOUND"}})
+
+        with self.server.lock:
+            cold = model not in self.server.warm_models
+            self.server.warm_models.add(model)
+        delay = config.model_delay.get(model, config.delay) + (config.cold_delay if cold else 0)
+        time.sleep(max(0.0, delay + random.uniform(-config.jitter, config.jitter)))
+
+        if random.random() < config.fail_rate:
+            status = config.fail_status
+            return self._send_json(status, {"error": {"code": status, "message": "Stub failure",
+                                                      "status": STATUS_NAMES.get(status, "UNKNOWN")}})
+
+        self._send_json(200, {
+            "candidates": [{
+                "content": {
+                    "role": "model",
+                    "parts": [{"inlineData": {"mimeType": "image/png", "data": self.server.image_b64}}],
+                },
+                "finishReason": "STOP",
+            }],
+            "modelVersion": model,
+        })
+
+    def log_message(self, format, *args):
+        if self.server.config.verbose:
+            super().log_message(format, *args)
+
+def make_server(config):
+    server = ThreadingHTTPServer((config.host, config.port), StubHandler)
+    server.daemon_threads = True
+    server.config = config
+    server.lock = threading.Lock()
+    server.warm_models = set()
+    server.stats = {"connections": 0, "requests": 0}
+    server.image_b64 = base64.b64encode(noise_png(config.image_size, config.seed)).decode()
+    return server
+
+def model_delay(text):
+    """'name=seconds' -> (name, seconds)"""
+    name, _, seconds = text.rpartition("=")
+    if not name:
+        raise argparse.ArgumentTypeError(f"expected MODEL=SECONDS, got {text!r}")
+    return name, float(seconds)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serve a fake Gemini generateContent endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.2, help="seconds before each response (default: 0.2)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="+/- seconds of random delay (default: 0.05)")
+    parser.add_argument("--model-delay", type=model_delay, action="append", default=[], metavar="MODEL=SECONDS",
+                        help="delay for one model instead of --delay (repeatable)")
+    parser.add_argument("--cold-delay", type=float, default=0.0,
+                        help="extra seconds on the first request to each model (default: 0)")
+    parser.add_argument("--missing-model", action="append", default=[], metavar="MODEL",
+                        help="answer 404 for this model (repeatable)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of requests that fail (default: 0)")
+    parser.add_argument("--fail-status", type=int, default=503, help="HTTP status of failures (default: 503)")
+    parser.add_argument("--image-size", type=int, default=256, help="side of the returned PNG (default: 256)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    return parser
+
+def main(argv=None):
+    config = build_parser().parse_args(argv)
+    config.model_delay = dict(config.model_delay)
+    random.seed(config.seed)
+    server = make_server(config)
+    print(f"Gemini stub listening on http://{config.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"{server.stats['requests']} requests over {server.stats['connections']} connections")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Latency, payload and error telemetry for Gemini requests
+
+Every generate_content attempt is recorded per model: its latency (kept
+raw for percentiles and bucketed for a Prometheus histogram), the bytes
+the server sent back, retries, and failures by category. At the end of a
+run the totals are written as JSON and as a Prometheus text file (the
+format node_exporter's textfile collector reads).
+"""
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60)
+
+ERROR_CATEGORIES = ("rate_limited", "client", "server", "timeout", "connection", "no_image", "other")
+
+# Categories worth another attempt
+RETRYABLE = {"rate_limited", "server", "timeout", "connection"}
+
+MODEL_IN_URL = re.compile(r"/models/([^/:]+):")
+
+def classify_error(error):
+    """Category of an exception raised by (or around) generate_content"""
+    import httpx
+    from google.genai import errors
+
+    if isinstance(error, errors.APIError):
+        if error.code == 429:
+            return "rate_limited"
+        return "server" if error.code >= 500 else "client"
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(error, httpx.TransportError):
+        return "connection"
+    return "other"
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile (q in 0..100) of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+class Telemetry:
+    """Per-model request statistics; safe to share between threads"""
+
+    def __init__(self):
+        self.models = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, model):
+        if model not in self.models:
+            self.models[model] = {
+                "latencies": [],
+                "buckets": [0] * len(LATENCY_BUCKETS),
+                "requests": 0,
+                "succeeded": 0,
+                "retries": 0,
+                "bytes_received": 0,
+                "errors": dict.fromkeys(ERROR_CATEGORIES, 0),
+            }
+        return self.models[model]
+
+    def record(self, model, seconds, error=None):
+        """One attempt: its latency and, if it failed, the error category"""
+        with self._lock:
+            stats = self._stats(model)
+            stats["requests"] += 1
+            stats["latencies"].append(seconds)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    stats["buckets"][i] += 1
+                    break
+            if error:
+                stats["errors"][error] += 1
+            else:
+                stats["succeeded"] += 1
+
+    def record_retry(self, model):
+        with self._lock:
+            self._stats(model)["retries"] += 1
+
+    def on_response(self, response):
+        """httpx response hook: count the body bytes against the model in the URL"""
+        match = MODEL_IN_URL.search(response.request.url.path)
+        if not match:
+            return
+        response.read()
+        with self._lock:
+            self._stats(match.group(1))["bytes_received"] += len(response.content)
+
+    def summary(self):
+        """JSON-ready totals per model, with p50/p95/p99 latency"""
+        with self._lock:
+            result = {}
+            for model, stats in sorted(self.models.items()):
+                latencies = sorted(stats["latencies"])
+                result[model] = {
+                    "requests": stats["requests"],
+                    "succeeded": stats["succeeded"],
+                    "retries": stats["retries"],
+                    "bytes_received": stats["bytes_received"],
+                    "errors": {k: v for k, v in stats["errors"].items() if v},
+                    "latency_seconds": {
+                        "p50": percentile(latencies, 50),
+                        "p95": percentile(latencies, 95),
+                        "p99": percentile(latencies, 99),
+                        "sum": sum(latencies),
+                        "histogram": dict(zip(map(str, LATENCY_BUCKETS), stats["buckets"])),
+                    },
+                }
+            return result
+
+    def prometheus(self):
+        """The same totals in the Prometheus text exposition format"""
+        summary = self.summary()
+        lines = [
+            "# HELP gemini_request_duration_seconds Latency of generate_content attempts.",
+            "# TYPE gemini_request_duration_seconds histogram",
+        ]
+        for model, stats in summary.items():
+            cumulative = 0
+            for bound, count in stats["latency_seconds"]["histogram"].items():
+                cumulative += count
+                lines.append(f'gemini_request_duration_seconds_bucket{{model="{model}",le="{bound}"}} {cumulative}')
+            lines.append(f'gemini_request_duration_seconds_bucket{{model="{model}",le="+Inf"}} {stats["requests"]}')
+            lines.append(f'gemini_request_duration_seconds_sum{{model="{model}"}} {stats["latency_seconds"]["sum"]:.6f}')
+            lines.append(f'gemini_request_duration_seconds_count{{model="{model}"}} {stats["requests"]}')
+
+        lines += [
+            "# HELP gemini_request_duration_quantile_seconds Latency percentiles over the run.",
+            "# TYPE gemini_request_duration_quantile_seconds gauge",
+        ]
+        for model, stats in summary.items():
+            for name, q in (("p50", "0.5"), ("p95", "0.95"), ("p99", "0.99")):
+                value = stats["latency_seconds"][name]
+                if value is not None:
+                    lines.append(f'gemini_request_duration_quantile_seconds{{model="{model}",quantile="{q}"}} {value:.6f}')
+
+        counters = [
+            ("gemini_requests_succeeded_total", "Attempts that returned an image.", "succeeded"),
+            ("gemini_retries_total", "Attempts that were retries of a failed one.", "retries"),
+            ("gemini_response_bytes_total", "Response body bytes received.", "bytes_received"),
+        ]
+        for name, help_text, key in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for model, stats in summary.items():
+                lines.append(f'{name}{{model="{model}"}} {stats[key]}')
+
+        lines += [
+            "# HELP gemini_request_errors_total Failed attempts by category.",
+            "# TYPE gemini_request_errors_total counter",
+        ]
+        for model, stats in summary.items():
+            for category in ERROR_CATEGORIES:
+                lines.append(f'gemini_request_errors_total{{model="{model}",category="{category}"}} '
+                             f'{stats["errors"].get(category, 0)}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, prefix):
+        """Write {prefix}.json and {prefix}.prom, each replaced atomically"""
+        for path, text in ((f"{prefix}.json", json.dumps(self.summary(), indent=2) + "\n"),
+                           (f"{prefix}.prom", self.prometheus())):
+            tmp = f"{path}.tmp"
+            Path(tmp).write_text(text)
+            os.replace(tmp, path)
+            print(f"✓ Wrote telemetry: {path}")
+
+    def report(self):
+        """One line per model for the end-of-run banner"""
+        for model, stats in self.summary().items():
+            latency = stats["latency_seconds"]
+            errors = ", ".join(f"{k} {v}" for k, v in stats["errors"].items()) or "none"
+            if latency["p50"] is not None:
+                print(f"  {model}: {stats['succeeded']}/{stats['requests']} ok, "
+                      f"p50 {latency['p50']:.2f}s p95 {latency['p95']:.2f}s p99 {latency['p99']:.2f}s, "
+                      f"{stats['bytes_received'] / 1024:.0f} KiB, {stats['retries']} retries, errors: {errors}")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Single entry point for the image generators
+
+    python generate.py placeholders [--svg] [--bundle FILE] [--dry-run]
+    python generate.py avatars [--svg] [--bundle FILE] [--dry-run]
+    python generate.py products [--concurrency N] [--http2] [--telemetry PREFIX] [--bundle FILE] [--dry-run]
+    python generate.py backdrop [--animate] [--cache-dir DIR] [--density N --stamps] [--dry-run]
+    python generate.py watch [--svg] [--kinds ...]
+    python generate.py dedupe [DIR ...] [--hardlink]
+    python generate.py ingest CATALOG [--kinds placeholder product] [--workers N]
+    python generate.py farm {coordinator,worker,status,manifest} [--queue render-queue.db]
+    python generate.py models [--probe [--models ...] [--runs N]]
+    python generate.py bundle {build,pack,list,extract,serve} BUNDLE ...
+
+Only argparse and the plain-data catalog are imported up front. Pillow,
+numpy and google.genai load inside the subcommand that needs them, so
+--help and --dry-run return immediately.
+"""
+import argparse
+import contextlib
+import sys
+
+def print_jobs(jobs):
+    for job in jobs:
+        print(f"  {job['output']}")
+    print(f"\n{len(jobs)} file(s) would be written")
+
+@contextlib.contextmanager
+def output_to(bundle):
+    """Write the generators' outputs into a bundle file if one was given"""
+    if not bundle:
+        yield
+        return
+    from asset_bundle import BundleWriter, print_summary
+    from image_manifest import bundle_outputs
+    with BundleWriter(bundle) as writer, bundle_outputs(writer):
+        yield
+    print_summary(bundle)
+
+def cmd_placeholders(args):
+    if args.dry_run:
+        from asset_jobs import build_jobs
+        return print_jobs(build_jobs(["placeholder"], svg=args.svg))
+
+    import generate_placeholders
+    with output_to(args.bundle):
+        generate_placeholders.main(svg=args.svg)
+
+def cmd_avatars(args):
+    if args.dry_run:
+        from asset_jobs import build_jobs
+        return print_jobs(build_jobs(["avatar", "portfolio", "feature"], svg=args.svg))
+
+    import generate_avatars_and_more
+    with output_to(args.bundle):
+        generate_avatars_and_more.main(svg=args.svg)
+
+def cmd_products(args):
+    if args.dry_run:
+        from asset_jobs import build_jobs
+        return print_jobs(build_jobs(["product"]))
+
+    import generate_silly_products
+    generate_silly_products.configure_transport(connect_timeout=args.connect_timeout,
+                                                read_timeout=args.read_timeout, http2=args.http2)
+    with output_to(args.bundle):
+        generate_silly_products.main(telemetry_prefix=args.telemetry, concurrency=args.concurrency)
+
+def cmd_backdrop(args):
+    from asset_jobs import BACKDROP_OUTPUT, load_backdrop
+
+    out = args.out or (BACKDROP_OUTPUT.rsplit('.', 1)[0] + '.webp' if args.animate else BACKDROP_OUTPUT)
+    if args.dry_run:
+        what = f"{args.frames}-frame animation" if args.animate else "still"
+        return print(f"  {out} ({what}, seed {args.seed})")
+
+    backdrop = load_backdrop()
+    if args.animate:
+        backdrop.main_animated(out, frames=args.frames, fps=args.fps, cache_dir=args.cache_dir,
+                               density=args.density, stamps=args.stamps, seed=args.seed,
+                               glitch_intensity=args.glitch_intensity, vignette_strength=args.vignette_strength)
+    else:
+        backdrop.main(out, seed=args.seed, glitch_intensity=args.glitch_intensity,
+                      vignette_strength=args.vignette_strength, cache_dir=args.cache_dir,
+                      density=args.density, stamps=args.stamps)
+
+def cmd_watch(args):
+    import watch_assets
+    try:
+        watch_assets.watch(args.kinds, svg=args.svg, interval=args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+def cmd_dedupe(args):
+    import dedupe_images
+    dedupe_images.main(args.extra)
+
+def cmd_ingest(args):
+    import ingest_catalog
+    ingest_catalog.main(args.extra)
+
+def cmd_farm(args):
+    import render_farm
+    render_farm.main(args.extra)
+
+def cmd_bundle(args):
+    import asset_bundle
+    asset_bundle.main(args.extra)
+
+def cmd_models(args):
+    import check_models
+    if args.probe:
+        check_models.probe(args.models, runs=args.runs, output=args.output or check_models.PROBE_RESULTS)
+    else:
+        check_models.list_models()
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="generate.py", description="Generate images for the apps")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("placeholders", help="gradient product placeholders")
+    p.add_argument("--svg", action="store_true", help="one SVG per product instead of a PNG per size")
+    p.add_argument("--bundle", metavar="FILE", help="write everything into one asset bundle instead of files")
+    p.add_argument("--dry-run", action="store_true", help="list the files without rendering")
+    p.set_defaults(func=cmd_placeholders)
+
+    p = sub.add_parser("avatars", help="avatars, portfolio and feature images")
+    p.add_argument("--svg", action="store_true", help="one SVG per avatar/feature instead of a PNG per size")
+    p.add_argument("--bundle", metavar="FILE", help="write everything into one asset bundle instead of files")
+    p.add_argument("--dry-run", action="store_true", help="list the files without rendering")
+    p.set_defaults(func=cmd_avatars)
+
+    p = sub.add_parser("products", help="AI product photos via Gemini (needs GEMINI_API_KEY)")
+    p.add_argument("--telemetry", default="gemini-telemetry",
+                   help="write request stats to TELEMETRY.json and TELEMETRY.prom (default: gemini-telemetry)")
+    p.add_argument("--concurrency", type=int, default=1,
+                   help="requests in flight at once; the connection pool is sized to match (default: 1)")
+    p.add_argument("--connect-timeout", type=float, default=10.0, help="seconds to open a connection (default: 10)")
+    p.add_argument("--read-timeout", type=float, default=120.0, help="seconds to wait for a response (default: 120)")
+    p.add_argument("--http2", action="store_true", help="multiplex requests over HTTP/2 (needs httpx[http2])")
+    p.add_argument("--bundle", metavar="FILE", help="write everything into one asset bundle instead of files")
+    p.add_argument("--dry-run", action="store_true", help="list the files without calling the API")
+    p.set_defaults(func=cmd_products)
+
+    p = sub.add_parser("backdrop", help="the Corrupted Commerce glitch backdrop")
+    p.add_argument("--animate", action="store_true", help="animated WebP/APNG loop instead of the still")
+    p.add_argument("--frames", type=int, default=60, help="frames in the loop (default: 60)")
+    p.add_argument("--fps", type=int, default=12, help="playback rate (default: 12)")
+    p.add_argument("--out", help="output path")
+    p.add_argument("--seed", type=int, default=42, help="random seed (default: 42)")
+    p.add_argument("--glitch-intensity", type=float, default=0.85)
+    p.add_argument("--vignette-strength", type=float, default=0.32)
+    p.add_argument("--cache-dir", help="persist each stage as a raw layer here and reuse unchanged ones")
+    p.add_argument("--density", type=float, default=1, help="multiply the number of carts and barcodes (default: 1)")
+    p.add_argument("--stamps", action="store_true", help="blit carts and barcodes from cached sprites")
+    p.add_argument("--dry-run", action="store_true", help="show what would be rendered")
+    p.set_defaults(func=cmd_backdrop)
+
+    p = sub.add_parser("watch", help="re-render assets as the generator scripts and catalog change")
+    p.add_argument("--kinds", nargs="+", choices=["avatar", "placeholder", "portfolio", "feature"])
+    p.add_argument("--svg", action="store_true", help="watch the SVG outputs instead of PNGs")
+    p.add_argument("--interval", type=float, default=0.2, help="seconds between checks (default: 0.2)")
+    p.set_defaults(func=cmd_watch)
+
+    # Options of dedupe, ingest, farm and bundle are passed through untouched, so `dedupe --help`
+    # shows dedupe_images.py's own help
+    p = sub.add_parser("dedupe", add_help=False, help="index images and report (or hardlink) duplicates")
+    p.set_defaults(func=cmd_dedupe)
+
+    p = sub.add_parser("ingest", add_help=False, help="stream a CSV/JSONL catalog into the product generators")
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser("farm", add_help=False, help="multi-process rendering: coordinator, workers and status")
+    p.set_defaults(func=cmd_farm)
+
+    p = sub.add_parser("bundle", add_help=False, help="pack assets into one mmap-served bundle file, list or serve it")
+    p.set_defaults(func=cmd_bundle)
+
+    p = sub.add_parser("models", help="list the Gemini models available to your API key, or probe their latency")
+    p.add_argument("--probe", action="store_true", help="time each candidate image model and rank them")
+    p.add_argument("--models", nargs="+", help="models to probe")
+    p.add_argument("--runs", type=int, default=3, help="requests per model; the first is the cold one (default: 3)")
+    p.add_argument("--output", help="where to write the ranking (default: model-probe.json here)")
+    p.set_defaults(func=cmd_models)
+
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command not in ("dedupe", "ingest", "farm", "bundle"):
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.extra = extra
+    args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
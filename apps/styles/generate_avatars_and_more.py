@@ -1,21 +1,42 @@
 #!/usr/bin/env python3
 """Generate avatars, portfolio images, and feature images"""
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from pathlib import Path
+from xml.sax.saxutils import escape
 import random
 import colorsys
 
-def generate_avatar(initials, size, output_path, color_hue=None):
-    """Generate a circular avatar with initials"""
+from asset_catalog import (AVATARS_DIR, PORTFOLIO_DIR, FEATURES_DIR, PORTFOLIO_PROJECTS, FEATURES,
+                           avatar_outputs, avatar_hue, portfolio_output, feature_output)
+from image_manifest import ManifestSet, active_bundle, save_image, save_svg
+from render_cache import load_font, gradient_mask
+
+def avatar_color(color_hue):
+    """Pastel RGB color for a hue"""
+    rgb = colorsys.hsv_to_rgb(color_hue, 0.6, 0.9)
+    return tuple(int(x * 255) for x in rgb)
+
+def avatar_layout(initials, width, height):
+    """Font, font size, text position and text bbox shared by PNG and SVG avatars"""
+    font_size = min(width, height) // 2
+
+    font = load_font("/system/fonts/Roboto-Bold.ttf", font_size)
+
+    bbox = font.getbbox(initials)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+    x = (width - text_width) // 2
+    y = (height - text_height) // 2 - bbox[1]
+    return font, font_size, (x, y), bbox
+
+def render_avatar(initials, size, color_hue=None):
+    """Render a circular avatar with initials"""
     width, height = map(int, size.split('x'))
 
     # Generate a random pastel color if not provided
     if color_hue is None:
         color_hue = random.random()
-
-    # Convert HSV to RGB for a pastel color
-    rgb = colorsys.hsv_to_rgb(color_hue, 0.6, 0.9)
-    bg_color = tuple(int(x * 255) for x in rgb)
+    bg_color = avatar_color(color_hue)
 
     # Create image with transparent background
     img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
@@ -24,52 +45,63 @@ def generate_avatar(initials, size, output_path, color_hue=None):
     # Draw circle
     draw.ellipse([0, 0, width-1, height-1], fill=bg_color)
 
-    # Try to load font
-    try:
-        font_size = min(width, height) // 2
-        font = ImageFont.truetype("/system/fonts/Roboto-Bold.ttf", font_size)
-    except:
-        font = ImageFont.load_default()
-
     # Draw initials
-    bbox = draw.textbbox((0, 0), initials, font=font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
-    x = (width - text_width) // 2
-    y = (height - text_height) // 2 - bbox[1]
-
+    font, _, (x, y), _ = avatar_layout(initials, width, height)
     draw.text((x, y), initials, font=font, fill='white')
 
-    img.save(output_path, 'PNG')
-    print(f"✓ Created avatar: {output_path}")
+    return img
 
-def generate_portfolio_image(title, size, output_path, theme="code"):
-    """Generate a portfolio/project preview image"""
+def svg_text(text, position, bbox, font_size):
+    """White SVG <text> centered on the box PIL would have drawn at position"""
+    cx = position[0] + (bbox[0] + bbox[2]) / 2
+    cy = position[1] + (bbox[1] + bbox[3]) / 2
+    return (f'<text x="{cx:g}" y="{cy:g}" font-family="Roboto, sans-serif" font-weight="bold" '
+            f'font-size="{font_size}" fill="white" text-anchor="middle" '
+            f'dominant-baseline="central">{escape(text)}</text>')
+
+def render_avatar_svg(initials, size, color_hue=None):
+    """Render a circular avatar with initials as resolution-independent SVG"""
     width, height = map(int, size.split('x'))
 
-    # Color schemes for different themes
-    themes = {
-        "code": (("#1e293b", "#334155"), ["// Code", "function()", "{...}"]),
-        "design": (("#581c87", "#7c3aed"), ["Design", "UI/UX", "Figma"]),
-        "web": (("#0c4a6e", "#0ea5e9"), ["<Web/>", "HTML", "CSS"]),
-        "data": (("#065f46", "#10b981"), ["Data", "Charts", "Analytics"]),
-        "mobile": (("#7c2d12", "#f97316"), ["Mobile", "iOS", "Android"]),
-        "ai": (("#831843", "#e11d48"), ["AI/ML", "Neural", "Network"]),
-    }
+    if color_hue is None:
+        color_hue = random.random()
+    r, g, b = avatar_color(color_hue)
+
+    _, font_size, position, bbox = avatar_layout(initials, width, height)
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}">'
+            f'<ellipse cx="{width / 2:g}" cy="{height / 2:g}" rx="{width / 2:g}" ry="{height / 2:g}" '
+            f'fill="rgb({r},{g},{b})"/>'
+            f'{svg_text(initials, position, bbox, font_size)}</svg>\n')
+
+def generate_avatar(initials, size, output_path, color_hue=None, manifest=None):
+    """Generate a circular avatar with initials (SVG if output_path ends in .svg)"""
+    if output_path.endswith('.svg'):
+        width, height = map(int, size.split('x'))
+        save_svg(render_avatar_svg(initials, size, color_hue), output_path, (width, height), manifest)
+    else:
+        img = render_avatar(initials, size, color_hue)
+        save_image(img, output_path, manifest, 'PNG')
+    print(f"✓ Created avatar: {output_path}")
 
-    colors, keywords = themes[theme]
+# Color schemes and keywords for the portfolio themes
+PORTFOLIO_THEMES = {
+    "code": (("#1e293b", "#334155"), ["// Code", "function()", "{...}"]),
+    "design": (("#581c87", "#7c3aed"), ["Design", "UI/UX", "Figma"]),
+    "web": (("#0c4a6e", "#0ea5e9"), ["<Web/>", "HTML", "CSS"]),
+    "data": (("#065f46", "#10b981"), ["Data", "Charts", "Analytics"]),
+    "mobile": (("#7c2d12", "#f97316"), ["Mobile", "iOS", "Android"]),
+    "ai": (("#831843", "#e11d48"), ["AI/ML", "Neural", "Network"]),
+}
+
+def render_portfolio_image(title, size, theme="code"):
+    """Render a portfolio/project preview image"""
+    width, height = map(int, size.split('x'))
+    colors, keywords = PORTFOLIO_THEMES[theme]
 
     # Create gradient background
     base = Image.new('RGB', (width, height), colors[0])
     top = Image.new('RGB', (width, height), colors[1])
-    mask = Image.new('L', (width, height))
-    mask_data = []
-    for y in range(height):
-        for x in range(width):
-            # Diagonal gradient
-            mask_data.append(int(255 * ((x + y) / (width + height))))
-    mask.putdata(mask_data)
-    base.paste(top, (0, 0), mask)
+    base.paste(top, (0, 0), gradient_mask(width, height, 'diagonal'))
 
     draw = ImageDraw.Draw(base)
 
@@ -88,12 +120,9 @@ def generate_portfolio_image(title, size, output_path, theme="code"):
     # Redraw for text
     draw = ImageDraw.Draw(base)
 
-    # Try to load fonts
-    try:
-        title_font = ImageFont.truetype("/system/fonts/Roboto-Bold.ttf", min(width, height) // 12)
-        keyword_font = ImageFont.truetype("/system/fonts/Roboto-Regular.ttf", min(width, height) // 20)
-    except:
-        title_font = keyword_font = ImageFont.load_default()
+    # Load fonts (cached; default font if missing)
+    title_font = load_font("/system/fonts/Roboto-Bold.ttf", min(width, height) // 12)
+    keyword_font = load_font("/system/fonts/Roboto-Regular.ttf", min(width, height) // 20)
 
     # Draw title
     bbox = draw.textbbox((0, 0), title, font=title_font)
@@ -114,144 +143,149 @@ def generate_portfolio_image(title, size, output_path, theme="code"):
     y = height // 2 + 20
     draw.text((x, y), keyword_text, font=keyword_font, fill=(255, 255, 255, 200))
 
-    base.save(output_path, 'PNG', quality=95)
+    return base
+
+def generate_portfolio_image(title, size, output_path, theme="code", manifest=None):
+    """Generate a portfolio/project preview image"""
+    img = render_portfolio_image(title, size, theme)
+    save_image(img, output_path, manifest, 'PNG', quality=95)
     print(f"✓ Created portfolio image: {output_path}")
 
-def generate_feature_image(title, size, output_path):
-    """Generate a feature/marketing image"""
+FEATURE_COLORS = [
+    ("#667eea", "#764ba2"),
+    ("#f093fb", "#f5576c"),
+    ("#4facfe", "#00f2fe"),
+    ("#43e97b", "#38f9d7"),
+]
+
+def feature_layout(title, width, height):
+    """Icon geometry, title font and title position shared by PNG and SVG feature images"""
+    center_x, center_y = width // 2, height // 2
+    icon_size = min(width, height) // 3
+    check_points = [
+        (center_x - icon_size//2, center_y),
+        (center_x - icon_size//4, center_y + icon_size//2),
+        (center_x + icon_size//2, center_y - icon_size//2)
+    ]
+
+    font_size = min(width, height) // 15
+    font = load_font("/system/fonts/Roboto-Bold.ttf", font_size)
+
+    bbox = font.getbbox(title)
+    title_width = bbox[2] - bbox[0]
+    x = (width - title_width) // 2
+    y = height - 60
+
+    return (center_x, center_y), icon_size, check_points, font, font_size, (x, y), bbox
+
+def render_feature_image(title, size):
+    """Render a feature/marketing image"""
     width, height = map(int, size.split('x'))
 
     # Gradient colors
-    colors = [
-        ("#667eea", "#764ba2"),
-        ("#f093fb", "#f5576c"),
-        ("#4facfe", "#00f2fe"),
-        ("#43e97b", "#38f9d7"),
-    ]
-    color_pair = random.choice(colors)
+    color_pair = random.choice(FEATURE_COLORS)
 
     # Create gradient
     base = Image.new('RGB', (width, height), color_pair[0])
     top = Image.new('RGB', (width, height), color_pair[1])
-    mask = Image.new('L', (width, height))
-    mask_data = []
-    for y in range(height):
-        for x in range(width):
-            mask_data.append(int(255 * (y / height)))
-    mask.putdata(mask_data)
-    base.paste(top, (0, 0), mask)
+    base.paste(top, (0, 0), gradient_mask(width, height, 'vertical'))
 
     draw = ImageDraw.Draw(base)
+    (center_x, center_y), icon_size, check_points, font, _, position, _ = feature_layout(title, width, height)
 
     # Add simple icon-like shape in center
-    center_x, center_y = width // 2, height // 2
-    icon_size = min(width, height) // 3
     draw.ellipse([center_x - icon_size, center_y - icon_size,
                   center_x + icon_size, center_y + icon_size],
                  outline='white', width=5)
 
     # Draw checkmark inside
-    check_points = [
-        (center_x - icon_size//2, center_y),
-        (center_x - icon_size//4, center_y + icon_size//2),
-        (center_x + icon_size//2, center_y - icon_size//2)
-    ]
     draw.line(check_points, fill='white', width=8, joint='curve')
 
     # Draw title at bottom
-    try:
-        font = ImageFont.truetype("/system/fonts/Roboto-Bold.ttf", min(width, height) // 15)
-    except:
-        font = ImageFont.load_default()
-
-    bbox = draw.textbbox((0, 0), title, font=font)
-    title_width = bbox[2] - bbox[0]
-    x = (width - title_width) // 2
-    y = height - 60
+    draw.text(position, title, font=font, fill='white')
 
-    draw.text((x, y), title, font=font, fill='white')
+    return base
 
-    base.save(output_path, 'PNG', quality=95)
+def render_feature_image_svg(title, size):
+    """Render a feature/marketing image as resolution-independent SVG"""
+    width, height = map(int, size.split('x'))
+    color_pair = random.choice(FEATURE_COLORS)
+
+    (center_x, center_y), icon_size, check_points, _, font_size, position, bbox = feature_layout(title, width, height)
+    points = " ".join(f"{x},{y}" for x, y in check_points)
+
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}">'
+            f'<defs><linearGradient id="bg" x1="0" y1="0" x2="0" y2="1">'
+            f'<stop offset="0" stop-color="{color_pair[0]}"/><stop offset="1" stop-color="{color_pair[1]}"/>'
+            f'</linearGradient></defs>'
+            f'<rect width="{width}" height="{height}" fill="url(#bg)"/>'
+            f'<circle cx="{center_x}" cy="{center_y}" r="{icon_size}" fill="none" stroke="white" stroke-width="5"/>'
+            f'<polyline points="{points}" fill="none" stroke="white" stroke-width="8" '
+            f'stroke-linejoin="round" stroke-linecap="round"/>'
+            f'{svg_text(title, position, bbox, font_size)}</svg>\n')
+
+def generate_feature_image(title, size, output_path, manifest=None):
+    """Generate a feature/marketing image (SVG if output_path ends in .svg)"""
+    if output_path.endswith('.svg'):
+        width, height = map(int, size.split('x'))
+        save_svg(render_feature_image_svg(title, size), output_path, (width, height), manifest)
+    else:
+        img = render_feature_image(title, size)
+        save_image(img, output_path, manifest, 'PNG', quality=95)
     print(f"✓ Created feature image: {output_path}")
 
-def main():
+def main(svg=False):
+    manifest = ManifestSet()
+
     # Create directories
-    Path("public/images/avatars").mkdir(parents=True, exist_ok=True)
-    Path("public/images/portfolio").mkdir(parents=True, exist_ok=True)
-    Path("public/images/features").mkdir(parents=True, exist_ok=True)
+    Path(AVATARS_DIR).mkdir(parents=True, exist_ok=True)
+    Path(PORTFOLIO_DIR).mkdir(parents=True, exist_ok=True)
+    Path(FEATURES_DIR).mkdir(parents=True, exist_ok=True)
 
     print("=" * 60)
     print("GENERATING USER AVATARS")
     print("=" * 60)
 
-    # Generate avatars with different initials and sizes
-    avatar_data = [
-        ("AT", "32x32"), ("AT", "40x40"), ("AT", "128x128"), ("AT", "150x150"),
-        ("SC", "32x32"), ("SC", "40x40"),
-        ("MJ", "32x32"), ("MJ", "40x40"),
-        ("ED", "32x32"), ("ED", "40x40"),
-        ("JS", "32x32"), ("JS", "40x40"),
-        ("SM", "40x40"), ("DC", "40x40"), ("ER", "40x40"),
-        ("MT", "40x40"), ("LA", "40x40"), ("JW", "40x40"),
-    ]
-
-    for initials, size in avatar_data:
-        output_path = f"public/images/avatars/{initials.lower()}-{size}.png"
+    # With svg, one resolution-independent file per person, laid out at their largest size
+    for initials, size, output_path in avatar_outputs(svg):
         # Use consistent color for same initials
-        color_hue = hash(initials) % 100 / 100
-        generate_avatar(initials, size, output_path, color_hue)
+        color_hue = avatar_hue(initials)
+        generate_avatar(initials, size, output_path, color_hue, manifest)
 
     print("\n" + "=" * 60)
     print("GENERATING PORTFOLIO/PROJECT IMAGES")
     print("=" * 60)
 
-    # Portfolio images with different themes
-    portfolio_projects = [
-        ("E-Commerce Platform", "800x600", "web"),
-        ("Mobile Banking App", "800x600", "mobile"),
-        ("Data Dashboard", "800x600", "data"),
-        ("Design System", "800x600", "design"),
-        ("AI Chatbot", "800x600", "ai"),
-        ("Portfolio Site", "800x600", "code"),
-        ("Featured Project", "600x400", "web"),
-        ("Side Project", "600x400", "code"),
-        ("Case Study", "400x300", "design"),
-        ("Recent Work", "400x300", "web"),
-        ("Featured Work", "1200x600", "web"),
-        ("Main Project", "800x500", "code"),
-    ]
-
-    for title, size, theme in portfolio_projects:
-        filename = title.lower().replace(' ', '-')
-        output_path = f"public/images/portfolio/{filename}-{size}.png"
-        generate_portfolio_image(title, size, output_path, theme)
+    for title, size, theme in PORTFOLIO_PROJECTS:
+        output_path = portfolio_output(title, size)
+        generate_portfolio_image(title, size, output_path, theme, manifest)
 
     print("\n" + "=" * 60)
     print("GENERATING FEATURE/MARKETING IMAGES")
     print("=" * 60)
 
-    # Feature images
-    features = [
-        "Fast Performance",
-        "Secure by Default",
-        "Easy to Use",
-        "24/7 Support",
-        "Cloud Sync",
-        "Mobile Ready",
-    ]
+    for feature in FEATURES:
+        output_path = feature_output(feature, svg)
+        generate_feature_image(feature, "600x400", output_path, manifest)
 
-    for feature in features:
-        filename = feature.lower().replace(' ', '-').replace('/', '-')
-        output_path = f"public/images/features/{filename}-600x400.png"
-        generate_feature_image(feature, "600x400", output_path)
+    print()
+    manifest.save()
 
     print("\n" + "=" * 60)
     print("GENERATION COMPLETE!")
     print("=" * 60)
+    if active_bundle() is not None:
+        print(f"\nImages added to bundle: {active_bundle().path}")
+        return
     print("\nImages generated:")
-    print(f"  Avatars: {len(list(Path('public/images/avatars').glob('*.png')))}")
-    print(f"  Portfolio: {len(list(Path('public/images/portfolio').glob('*.png')))}")
-    print(f"  Features: {len(list(Path('public/images/features').glob('*.png')))}")
+    ext = 'svg' if svg else 'png'
+    print(f"  Avatars: {len(list(Path(AVATARS_DIR).glob(f'*.{ext}')))}")
+    print(f"  Portfolio: {len(list(Path(PORTFOLIO_DIR).glob('*.png')))}")
+    print(f"  Features: {len(list(Path(FEATURES_DIR).glob(f'*.{ext}')))}")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate avatars, portfolio, and feature images")
+    parser.add_argument("--svg", action="store_true",
+                        help="write one SVG per avatar and feature instead of PNGs at each size")
+    main(svg=parser.parse_args().svg)
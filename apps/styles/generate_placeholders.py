@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 """Generate colorful placeholder images with product names"""
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from pathlib import Path
+from xml.sax.saxutils import escape
 import random
 
+from asset_catalog import PRODUCTS_DIR, SILLY_PRODUCTS, REGULAR_PRODUCTS, product_outputs
+from image_manifest import ManifestSet, active_bundle, save_image, save_svg
+from render_cache import load_font, gradient_mask
+
 # Color palettes for different product categories
 PALETTES = {
     "silly": [
@@ -26,13 +31,7 @@ def create_gradient_image(width, height, color1, color2):
     """Create a gradient image"""
     base = Image.new('RGB', (width, height), color1)
     top = Image.new('RGB', (width, height), color2)
-    mask = Image.new('L', (width, height))
-    mask_data = []
-    for y in range(height):
-        for x in range(width):
-            mask_data.append(int(255 * (x / width)))
-    mask.putdata(mask_data)
-    base.paste(top, (0, 0), mask)
+    base.paste(top, (0, 0), gradient_mask(width, height, 'horizontal'))
     return base
 
 def wrap_text(text, font, max_width):
@@ -56,112 +55,152 @@ def wrap_text(text, font, max_width):
 
     return lines
 
-def generate_placeholder(name, size, output_path, palette_type="tech"):
-    """Generate a placeholder image with gradient and text"""
-    width, height = map(int, size.split('x'))
-
-    # Select random colors from palette
-    colors = random.choice(PALETTES[palette_type])
-
-    # Create gradient background
-    img = create_gradient_image(width, height, colors[0], colors[1])
-    draw = ImageDraw.Draw(img)
+def placeholder_layout(name, size_label, width, height):
+    """Fonts and text positions shared by PNG and SVG placeholders
 
-    # Try to load a font, fallback to default
-    try:
-        # Calculate font size based on image size
-        font_size = min(width, height) // 8
-        font = ImageFont.truetype("/system/fonts/Roboto-Bold.ttf", font_size)
-        small_font = ImageFont.truetype("/system/fonts/Roboto-Regular.ttf", font_size // 2)
-    except:
-        font = ImageFont.load_default()
-        small_font = font
+    Returns (font_size, font, small_font, lines, label) where lines holds
+    (text, (x, y), bbox) for each wrapped line of the product name and
+    label holds ((x, y), bbox) for the size label.
+    """
+    # Calculate font size based on image size; fonts fall back to the default
+    font_size = min(width, height) // 8
+    font = load_font("/system/fonts/Roboto-Bold.ttf", font_size)
+    small_font = load_font("/system/fonts/Roboto-Regular.ttf", font_size // 2)
 
     # Format the product name
     display_name = name.replace('-', ' ').title()
 
     # Wrap text to fit
     max_text_width = width * 0.8
-    lines = wrap_text(display_name, font, max_text_width)
+    wrapped = wrap_text(display_name, font, max_text_width)
 
     # Calculate total text height
     line_height = font_size + 10
-    total_text_height = len(lines) * line_height
+    total_text_height = len(wrapped) * line_height
 
-    # Draw text centered
+    # Center each line
+    lines = []
     y = (height - total_text_height) // 2
-    for line in lines:
-        bbox = draw.textbbox((0, 0), line, font=font)
+    for line in wrapped:
+        bbox = font.getbbox(line)
         text_width = bbox[2] - bbox[0]
         x = (width - text_width) // 2
+        lines.append((line, (x, y), bbox))
+        y += line_height
+
+    # Size label in corner
+    bbox = small_font.getbbox(size_label)
+    size_width = bbox[2] - bbox[0]
+    size_height = bbox[3] - bbox[1]
+    label = ((width - size_width - 10, height - size_height - 10), bbox)
+
+    return font_size, font, small_font, lines, label
+
+def render_placeholder(name, size, palette_type="tech"):
+    """Render a placeholder image with gradient and text"""
+    width, height = map(int, size.split('x'))
+
+    # Select random colors from palette
+    colors = random.choice(PALETTES[palette_type])
+
+    # Create gradient background
+    img = create_gradient_image(width, height, colors[0], colors[1])
+    draw = ImageDraw.Draw(img)
 
+    _, font, small_font, lines, (label_pos, _) = placeholder_layout(name, size, width, height)
+
+    # Draw text centered
+    for line, (x, y), _ in lines:
         # Draw shadow
         draw.text((x + 2, y + 2), line, font=font, fill=(0, 0, 0, 128))
         # Draw text
         draw.text((x, y), line, font=font, fill='white')
-        y += line_height
 
     # Draw size label in corner
-    size_label = size
-    bbox = draw.textbbox((0, 0), size_label, font=small_font)
-    size_width = bbox[2] - bbox[0]
-    size_height = bbox[3] - bbox[1]
-    draw.text((width - size_width - 10, height - size_height - 10),
-              size_label, font=small_font, fill=(255, 255, 255, 180))
+    draw.text(label_pos, size, font=small_font, fill=(255, 255, 255, 180))
+
+    return img
+
+def render_placeholder_svg(name, size, palette_type="tech"):
+    """Render a placeholder as resolution-independent SVG
+
+    The layout is computed at `size`; the size label is left out since the
+    file is served at every size.
+    """
+    width, height = map(int, size.split('x'))
+    colors = random.choice(PALETTES[palette_type])
+    font_size, _, _, lines, _ = placeholder_layout(name, size, width, height)
+
+    text = []
+    for line, (x, y), bbox in lines:
+        # Center on the box PIL would have drawn, so SVG fonts with other metrics stay centered
+        cx = x + (bbox[0] + bbox[2]) / 2
+        cy = y + (bbox[1] + bbox[3]) / 2
+        for dx, fill in ((2, "black"), (0, "white")):
+            text.append(f'<text x="{cx + dx:g}" y="{cy + dx:g}" fill="{fill}">{escape(line)}</text>')
+
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}">'
+            f'<defs><linearGradient id="bg">'
+            f'<stop offset="0" stop-color="{colors[0]}"/><stop offset="1" stop-color="{colors[1]}"/>'
+            f'</linearGradient></defs>'
+            f'<rect width="{width}" height="{height}" fill="url(#bg)"/>'
+            f'<g font-family="Roboto, sans-serif" font-weight="bold" font-size="{font_size}" '
+            f'text-anchor="middle" dominant-baseline="central">{"".join(text)}</g></svg>\n')
+
+def generate_placeholder(name, size, output_path, palette_type="tech", manifest=None):
+    """Generate a placeholder image with gradient and text (SVG if output_path ends in .svg)"""
+    if output_path.endswith('.svg'):
+        width, height = map(int, size.split('x'))
+        save_svg(render_placeholder_svg(name, size, palette_type), output_path, (width, height), manifest)
+        print(f"✓ Created: {output_path}")
+        return
+
+    img = render_placeholder(name, size, palette_type)
 
     # Save image
-    img.save(output_path, 'PNG', quality=95)
+    save_image(img, output_path, manifest, 'PNG', quality=95)
     print(f"✓ Created: {output_path}")
 
-def main():
-    output_dir = Path("public/images/products")
+def main(svg=False):
+    manifest = ManifestSet()
+    output_dir = Path(PRODUCTS_DIR)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Silly products
-    silly_products = [
-        ("self-aware-toaster", ["300x300", "600x600"]),
-        ("invisible-socks", ["300x300", "600x600"]),
-        ("telepathic-remote", ["300x300", "600x600"]),
-        ("self-folding-basket", ["300x300", "600x600"]),
-        ("procrastination-timer", ["300x300", "600x600"]),
-    ]
-
-    # Regular products
-    regular_products = [
-        ("wireless-headphones", ["150x150", "200x200", "400x400"]),
-        ("mechanical-keyboard", ["150x150", "200x200", "400x400"]),
-        ("ergonomic-mouse", ["150x150", "200x200", "400x400"]),
-        ("usb-c-hub", ["200x200"]),
-        ("monitor-stand", ["200x200"]),
-        ("desk-mat", ["200x200"]),
-        ("cable-kit", ["200x200"]),
-    ]
-
     print("=" * 60)
     print("GENERATING SILLY PRODUCT PLACEHOLDERS")
     print("=" * 60)
 
-    for name, sizes in silly_products:
+    for product in SILLY_PRODUCTS:
+        name = product['name']
         print(f"\n📦 {name.replace('-', ' ').title()}")
-        for size in sizes:
-            output_path = output_dir / f"{name}-{size}.png"
-            generate_placeholder(name, size, str(output_path), palette_type="silly")
+        for size, output_path in product_outputs(name, product['sizes'], svg):
+            generate_placeholder(name, size, output_path, palette_type="silly", manifest=manifest)
 
     print("\n" + "=" * 60)
     print("GENERATING REGULAR PRODUCT PLACEHOLDERS")
     print("=" * 60)
 
-    for name, sizes in regular_products:
+    for product in REGULAR_PRODUCTS:
+        name = product['name']
         print(f"\n📦 {name.replace('-', ' ').title()}")
-        for size in sizes:
-            output_path = output_dir / f"{name}-{size}.png"
-            generate_placeholder(name, size, str(output_path), palette_type="tech")
+        for size, output_path in product_outputs(name, product['sizes'], svg):
+            generate_placeholder(name, size, output_path, palette_type="tech", manifest=manifest)
+
+    print()
+    manifest.save()
 
     print("\n" + "=" * 60)
     print("GENERATION COMPLETE!")
     print("=" * 60)
-    print(f"\nImages saved to: {output_dir.absolute()}")
-    print(f"Total images generated: {len(list(output_dir.glob('*.png')))}")
+    if active_bundle() is not None:
+        print(f"\nImages added to bundle: {active_bundle().path}")
+    else:
+        print(f"\nImages saved to: {output_dir.absolute()}")
+        print(f"Total images generated: {len(list(output_dir.glob('*.svg' if svg else '*.png')))}")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate colorful placeholder images with product names")
+    parser.add_argument("--svg", action="store_true",
+                        help="write one SVG per product instead of PNGs at each size")
+    main(svg=parser.parse_args().svg)
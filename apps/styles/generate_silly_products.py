@@ -1,90 +1,116 @@
 #!/usr/bin/env python3
 """Generate silly product images using Gemini API"""
+import json
 import os
-from google import genai
-from google.genai import types
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# Initialize Gemini client
-api_key = os.getenv('GEMINI_API_KEY')
-if not api_key:
-    raise ValueError("GEMINI_API_KEY not found in environment")
-
-client = genai.Client(api_key=api_key)
-
-# Define silly products with creative prompts
-silly_products = [
-    {
-        "name": "self-aware-toaster",
-        "sizes": ["300x300", "600x600"],
-        "prompt": "A retro chrome toaster with an LCD screen displaying judgemental facial expressions and emojis, glowing RGB LED buttons on the side, sitting on a modern kitchen counter, product photography, 4K, professional lighting, slightly humorous but high-quality commercial product photo"
-    },
-    {
-        "name": "invisible-socks",
-        "sizes": ["300x300", "600x600"],
-        "prompt": "An empty open sock package with a label reading 'Invisible Socks', with slight shimmer effects in the air where socks would be, professional product photography on white background, humorous commercial product photo, 4K quality"
-    },
-    {
-        "name": "telepathic-remote",
-        "sizes": ["300x300", "600x600"],
-        "prompt": "A futuristic TV remote with glowing brain wave sensors, holographic display showing thought patterns, metallic silver and blue color scheme, floating slightly above surface, professional product photography, 4K, sci-fi aesthetic but commercial quality"
-    },
-    {
-        "name": "self-folding-basket",
-        "sizes": ["300x300", "600x600"],
-        "prompt": "A high-tech laundry basket with robotic arms inside, LED indicators, sleek modern design with chrome and white plastic, clothes being automatically folded by mechanical arms, professional product photography, 4K, futuristic home appliance"
-    },
-    {
-        "name": "procrastination-timer",
-        "sizes": ["300x300", "600x600"],
-        "prompt": "A quirky digital timer device with a snooze button that takes up 80% of the surface, tiny start button, display showing 'Maybe Later', retro-futuristic design, sitting on a desk, professional product photography, humorous but commercial quality, 4K"
-    },
-]
-
-# Additional regular products for e-commerce templates
-regular_products = [
-    {
-        "name": "wireless-headphones",
-        "sizes": ["150x150", "200x200", "400x400"],
-        "prompt": "Premium over-ear wireless headphones in matte black with rose gold accents, soft leather cushions, modern minimalist design, professional product photography on white background, 4K quality"
-    },
-    {
-        "name": "mechanical-keyboard",
-        "sizes": ["150x150", "200x200", "400x400"],
-        "prompt": "RGB mechanical gaming keyboard with colorful backlighting, floating keycaps design, black aluminum frame, professional product photography on white background, 4K quality"
-    },
-    {
-        "name": "ergonomic-mouse",
-        "sizes": ["150x150", "200x200", "400x400"],
-        "prompt": "Wireless ergonomic vertical mouse in matte black, modern design with blue LED accents, professional product photography on white background, 4K quality"
-    },
-    {
-        "name": "usb-c-hub",
-        "sizes": ["200x200"],
-        "prompt": "Sleek 7-in-1 USB-C hub with multiple ports visible, aluminum body in space gray, professional product photography on white background, 4K quality"
-    },
-    {
-        "name": "monitor-stand",
-        "sizes": ["200x200"],
-        "prompt": "Adjustable monitor stand in black aluminum with sleek modern design, showing multiple height adjustment levels, professional product photography on white background, 4K quality"
-    },
-    {
-        "name": "desk-mat",
-        "sizes": ["200x200"],
-        "prompt": "XXL desk mat with geometric dark pattern, extended mouse pad surface, rolled at one corner to show thickness, professional product photography, 4K quality"
-    },
-    {
-        "name": "cable-kit",
-        "sizes": ["200x200"],
-        "prompt": "Cable management kit with various clips, ties, and organizers arranged neatly, black and gray colors, professional product photography on white background, 4K quality"
-    },
-]
-
-def generate_image(prompt: str, size: str, output_path: str):
+
+from asset_catalog import PRODUCTS_DIR, SILLY_PRODUCTS, REGULAR_PRODUCTS, product_outputs
+from check_models import PROBE_RESULTS
+from gemini_telemetry import RETRYABLE, Telemetry, classify_error
+from image_manifest import ManifestSet, active_bundle, save_encoded
+
+# Used when there is no GEMINI_MODEL and no model-probe.json from check_models.py --probe
+DEFAULT_MODEL = 'imagen-4.0-fast-generate-001'
+
+# Attempts per image for rate limits, 5xx, timeouts and dropped connections
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 1.0  # seconds, doubled after each failure
+
+# HTTP transport: one pooled client shared by every request and thread
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 120.0  # image generation can take a while
+KEEPALIVE_EXPIRY = 60.0  # seconds an idle pooled connection stays open
+
+_client = None
+_http = None
+_model = None
+_transport = {
+    "concurrency": 1,
+    "connect_timeout": CONNECT_TIMEOUT,
+    "read_timeout": READ_TIMEOUT,
+    "http2": False,
+}
+
+# Request statistics for this process; exported at the end of main()
+telemetry = Telemetry()
+
+def configure_transport(concurrency=None, connect_timeout=None, read_timeout=None, http2=None):
+    """Change the HTTP transport settings; the next get_client() builds a client with them"""
+    global _client, _http
+    for key, value in (("concurrency", concurrency), ("connect_timeout", connect_timeout),
+                       ("read_timeout", read_timeout), ("http2", http2)):
+        if value is not None:
+            _transport[key] = value
+    if _http is not None:
+        _http.close()
+    _client = _http = None
+
+def http_client():
+    """Pooled httpx client with one kept-alive connection per concurrent request"""
+    import httpx
+
+    http2 = _transport["http2"]
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            print("✗ HTTP/2 needs the h2 package (pip install 'httpx[http2]'); using HTTP/1.1")
+            http2 = False
+
+    concurrency = max(1, _transport["concurrency"])
+    timeout = httpx.Timeout(_transport["read_timeout"], connect=_transport["connect_timeout"])
+
+    def apply_timeout(request):
+        # The SDK passes timeout=None per request, which would switch httpx timeouts off
+        request.extensions["timeout"] = timeout.as_dict()
+
+    return httpx.Client(
+        http2=http2,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency,
+                            keepalive_expiry=KEEPALIVE_EXPIRY),
+        event_hooks={'request': [apply_timeout], 'response': [telemetry.on_response]},
+    )
+
+def get_client():
+    """Gemini client, created on first use so importing this module has no side effects
+
+    Set GEMINI_BASE_URL to send requests somewhere else, e.g. gemini_stub.py.
+    """
+    global _client, _http
+    if _client is None:
+        from dotenv import load_dotenv
+        from google import genai
+        from google.genai import types
+
+        # Load environment variables
+        load_dotenv()
+
+        api_key = os.getenv('GEMINI_API_KEY')
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not found in environment")
+
+        _http = http_client()
+        http_options = types.HttpOptions(base_url=os.getenv('GEMINI_BASE_URL'), httpx_client=_http)
+        _client = genai.Client(api_key=api_key, http_options=http_options)
+    return _client
+
+def get_model():
+    """GEMINI_MODEL, else the fastest model in the last probe, else DEFAULT_MODEL"""
+    global _model
+    if _model is None:
+        _model = os.getenv('GEMINI_MODEL')
+        if not _model and PROBE_RESULTS.exists():
+            try:
+                _model = json.loads(PROBE_RESULTS.read_text()).get("fastest")
+            except ValueError:
+                print(f"✗ Ignoring unreadable {PROBE_RESULTS.name}")
+        _model = _model or DEFAULT_MODEL
+    return _model
+
+def generate_image(prompt: str, size: str, output_path: str, manifest: ManifestSet = None):
     """Generate a single image using Gemini API"""
     # Determine aspect ratio from size
     width, height = map(int, size.split('x'))
@@ -97,60 +123,102 @@ def generate_image(prompt: str, size: str, output_path: str):
 
     print(f"Generating {size} image: {output_path}")
 
-    try:
-        response = client.models.generate_content(
-            model='imagen-4.0-fast-generate-001',
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_modalities=['image']
+    from google.genai import types
+    client = get_client()
+    model = get_model()
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        start = time.perf_counter()
+        try:
+            response = client.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_modalities=['image']
+                )
             )
-        )
+        except Exception as e:
+            category = classify_error(e)
+            telemetry.record(model, time.perf_counter() - start, category)
+            if category in RETRYABLE and attempt < MAX_ATTEMPTS:
+                print(f"  Retrying after {category} error: {e}")
+                telemetry.record_retry(model)
+                time.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+                continue
+            print(f"✗ Error generating {output_path}: {e}")
+            return False
 
         # Save the generated image
-        for part in response.candidates[0].content.parts:
+        candidates = response.candidates or []
+        parts = candidates[0].content.parts if candidates and candidates[0].content else None
+        for part in parts or []:
             if part.inline_data:
-                with open(output_path, 'wb') as f:
-                    f.write(part.inline_data.data)
+                telemetry.record(model, time.perf_counter() - start)
+                save_encoded(part.inline_data.data, output_path, manifest)
                 print(f"✓ Saved: {output_path}")
                 return True
 
-    except Exception as e:
-        print(f"✗ Error generating {output_path}: {e}")
+        telemetry.record(model, time.perf_counter() - start, "no_image")
+        print(f"✗ No image returned for {output_path}")
         return False
 
-    return False
+def main(telemetry_prefix="gemini-telemetry", concurrency=1):
+    configure_transport(concurrency=concurrency)
+    get_client()  # Fail fast without an API key
+    manifest = ManifestSet()
 
-def main():
     # Create output directory
-    output_dir = Path("public/images/products")
+    output_dir = Path(PRODUCTS_DIR)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    def generate_all(products, pool):
+        """Request every size of every product, `concurrency` at a time; returns how many succeeded"""
+        jobs = [(product['prompt'], size, output_path) for product in products
+                for size, output_path in product_outputs(product['name'], product['sizes'])]
+        return sum(pool.map(lambda job: generate_image(*job, manifest), jobs))
+
     print("=" * 60)
     print("GENERATING SILLY PRODUCT IMAGES")
     print("=" * 60)
+    print(f"Model: {get_model()} ({concurrency} concurrent request(s))")
 
-    # Generate silly products
-    for product in silly_products:
-        print(f"\n📦 {product['name'].replace('-', ' ').title()}")
-        for size in product['sizes']:
-            output_path = output_dir / f"{product['name']}-{size}.png"
-            generate_image(product['prompt'], size, str(output_path))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        # Generate silly products
+        saved = generate_all(SILLY_PRODUCTS, pool)
 
-    print("\n" + "=" * 60)
-    print("GENERATING REGULAR PRODUCT IMAGES")
-    print("=" * 60)
+        print("\n" + "=" * 60)
+        print("GENERATING REGULAR PRODUCT IMAGES")
+        print("=" * 60)
 
-    # Generate regular products
-    for product in regular_products:
-        print(f"\n📦 {product['name'].replace('-', ' ').title()}")
-        for size in product['sizes']:
-            output_path = output_dir / f"{product['name']}-{size}.png"
-            generate_image(product['prompt'], size, str(output_path))
+        # Generate regular products
+        saved += generate_all(REGULAR_PRODUCTS, pool)
+
+    print()
+    manifest.save()
 
     print("\n" + "=" * 60)
     print("GENERATION COMPLETE!")
     print("=" * 60)
-    print(f"\nImages saved to: {output_dir.absolute()}")
+    if active_bundle() is not None:
+        print(f"\nImages added to bundle: {active_bundle().path}")
+    else:
+        print(f"\nImages saved to: {output_dir.absolute()}")
+    print(f"Saved {saved} image(s) in {time.perf_counter() - start:.1f}s")
+
+    print("\nRequests:")
+    telemetry.report()
+    telemetry.export(telemetry_prefix)
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate product photos with Gemini")
+    parser.add_argument("--telemetry", default="gemini-telemetry",
+                        help="write request stats to TELEMETRY.json and TELEMETRY.prom (default: gemini-telemetry)")
+    parser.add_argument("--concurrency", type=int, default=1, help="requests in flight at once (default: 1)")
+    parser.add_argument("--connect-timeout", type=float, default=CONNECT_TIMEOUT)
+    parser.add_argument("--read-timeout", type=float, default=READ_TIMEOUT)
+    parser.add_argument("--http2", action="store_true", help="multiplex requests over HTTP/2 (needs h2)")
+    args = parser.parse_args()
+    configure_transport(connect_timeout=args.connect_timeout, read_timeout=args.read_timeout, http2=args.http2)
+    main(telemetry_prefix=args.telemetry, concurrency=args.concurrency)
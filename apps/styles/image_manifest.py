@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""manifest.json of generated images for the Next.js apps
+
+Each output directory gets a manifest.json mapping file name to its
+dimensions, byte size, content hash and blur placeholders, so pages can
+reserve layout space and show a blur-up preview without fetching the
+image. Placeholders are computed from the in-memory image as it is saved,
+so nothing is decoded a second time.
+
+Inside bundle_outputs(writer), the save_* helpers and the manifests go
+into an asset bundle (see asset_bundle.py) instead of separate files.
+
+    {"wireless-headphones-200x200.png": {"width": 200, "height": 200,
+     "bytes": 4211, "sha256": "...", "blurhash": "LKO2?U%2Tw=w]~RBVZRi};RPxuwH",
+     "blurDataURL": "data:image/png;base64,..."}}
+"""
+import base64
+import contextlib
+import hashlib
+import io
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+# Longest side of the images the placeholders are computed from
+BLURHASH_SAMPLE = 32
+LQIP_SIZE = 8
+
+# BundleWriter that outputs go to instead of files, while bundle_outputs() is active
+_bundle = None
+
+def _base83(value, length):
+    return "".join(BASE83[(value // 83 ** (length - 1 - i)) % 83] for i in range(length))
+
+def _thumbnail(img, longest):
+    """Small opaque RGB copy of img, flattened onto white"""
+    img = img.copy()
+    img.thumbnail((longest, longest), Image.BILINEAR, reducing_gap=2.0)
+    if img.mode in ('RGBA', 'LA', 'P'):
+        img = img.convert('RGBA')
+        flat = Image.new('RGB', img.size, 'white')
+        flat.paste(img, mask=img.getchannel('A'))
+        return flat
+    return img.convert('RGB')
+
+def blurhash(img, x_components=4, y_components=3):
+    """BlurHash of an image, with all DCT components computed in one matrix product"""
+    pixels = np.asarray(_thumbnail(img, BLURHASH_SAMPLE), dtype=np.float64) / 255
+    linear = np.where(pixels <= 0.04045, pixels / 12.92, ((pixels + 0.055) / 1.055) ** 2.4)
+    height, width, _ = linear.shape
+
+    basis_x = np.cos(np.pi * np.outer(np.arange(x_components), np.arange(width)) / width)
+    basis_y = np.cos(np.pi * np.outer(np.arange(y_components), np.arange(height)) / height)
+    factors = np.einsum('jy,yxc,ix->jic', basis_y, linear, basis_x) / (width * height)
+    factors[1:, :] *= 2
+    factors[0, 1:] *= 2
+    factors = factors.reshape(-1, 3)
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83((x_components - 1) + (y_components - 1) * 9, 1)
+
+    if len(ac):
+        quantised_max = int(max(0, min(82, np.floor(np.abs(ac).max() * 166 - 0.5))))
+        max_value = (quantised_max + 1) / 166
+        result += _base83(quantised_max, 1)
+    else:
+        max_value = 1
+        result += _base83(0, 1)
+
+    v = np.clip(dc, 0, 1)
+    srgb = np.where(v <= 0.0031308, v * 12.92 * 255 + 0.5, (1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5).astype(int)
+    result += _base83((int(srgb[0]) << 16) + (int(srgb[1]) << 8) + int(srgb[2]), 4)
+
+    scaled = ac / max_value
+    quant = np.clip(np.floor(np.sign(scaled) * np.abs(scaled) ** 0.5 * 9 + 9.5), 0, 18).astype(int)
+    for r, g, b in quant:
+        result += _base83(int(r) * 19 * 19 + int(g) * 19 + int(b), 2)
+
+    return result
+
+def lqip_data_url(img):
+    """Tiny PNG data URL, usable directly as next/image blurDataURL"""
+    buf = io.BytesIO()
+    _thumbnail(img, LQIP_SIZE).save(buf, 'PNG', optimize=True)
+    return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()
+
+class ManifestSet:
+    """One manifest.json per output directory, merged with what is already on disk"""
+
+    def __init__(self, filename="manifest.json"):
+        self.filename = filename
+        self.manifests = {}
+        # Generators may save from several threads at once
+        self._lock = threading.Lock()
+
+    def _entries(self, directory):
+        if directory not in self.manifests:
+            path = directory / self.filename
+            # A bundle starts empty, so there is nothing on disk to merge with
+            exists = _bundle is None and path.exists()
+            self.manifests[directory] = json.loads(path.read_text()) if exists else {}
+        return self.manifests[directory]
+
+    def add(self, output_path, data, img=None, size=None):
+        """Record a written file; img gives dimensions and placeholders, size (w, h) is for vectors"""
+        output_path = Path(output_path)
+        width, height = img.size if img is not None else size
+        entry = {
+            "width": width,
+            "height": height,
+            "bytes": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+        }
+        if img is not None:
+            entry["blurhash"] = blurhash(img)
+            entry["blurDataURL"] = lqip_data_url(img)
+        return self.put(output_path, entry)
+
+    def put(self, output_path, entry):
+        """Record an entry computed elsewhere (e.g. by a worker process)"""
+        output_path = Path(output_path)
+        with self._lock:
+            self._entries(output_path.parent)[output_path.name] = entry
+        return entry
+
+    def get(self, output_path):
+        """The entry recorded for output_path, or None"""
+        output_path = Path(output_path)
+        with self._lock:
+            return self._entries(output_path.parent).get(output_path.name)
+
+    def save(self):
+        for directory, entries in self.manifests.items():
+            path = directory / self.filename
+            write_output(path, (json.dumps(entries, indent=2, sort_keys=True) + "\n").encode())
+            print(f"✓ Wrote manifest: {path} ({len(entries)} images)")
+
+def write_atomic(output_path, data):
+    """Write via a temporary file and rename, so readers never see a partial image"""
+    tmp = f"{output_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    Path(tmp).write_bytes(data)
+    os.replace(tmp, output_path)
+
+@contextlib.contextmanager
+def bundle_outputs(writer):
+    """Send everything the save_* helpers write into writer until the block exits"""
+    global _bundle
+    previous, _bundle = _bundle, writer
+    try:
+        yield writer
+    finally:
+        _bundle = previous
+
+def active_bundle():
+    """The BundleWriter outputs currently go to, or None"""
+    return _bundle
+
+def write_output(output_path, data):
+    """Write a file, or add it to the active bundle"""
+    if _bundle is not None:
+        _bundle.add(str(output_path), data)
+    else:
+        write_atomic(output_path, data)
+
+def save_image(img, output_path, manifest=None, format='PNG', **params):
+    """Encode img once, write it, and record it in the manifest"""
+    buf = io.BytesIO()
+    img.save(buf, format, **params)
+    data = buf.getvalue()
+    write_output(output_path, data)
+    if manifest is not None:
+        manifest.add(output_path, data, img=img)
+    return data
+
+def save_svg(svg, output_path, size, manifest=None):
+    """Write SVG markup and record it in the manifest with its viewBox size"""
+    data = svg.encode()
+    write_output(output_path, data)
+    if manifest is not None:
+        manifest.add(output_path, data, size=size)
+    return data
+
+def save_encoded(data, output_path, manifest=None):
+    """Write already-encoded image bytes (e.g. from an API) and record them in the manifest"""
+    write_output(output_path, data)
+    if manifest is not None:
+        img = Image.open(io.BytesIO(data))
+        width, height = img.size
+        # JPEG can decode straight to a reduced scale; other formats ignore this
+        img.draft('RGB', (BLURHASH_SAMPLE * 2, BLURHASH_SAMPLE * 2))
+        entry = manifest.add(output_path, data, img=img)
+        entry["width"], entry["height"] = width, height
+    return data
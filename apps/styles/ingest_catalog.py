@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Generate product images for a whole catalog export, streaming
+
+Reads a CSV or JSONL catalog one row at a time and feeds placeholder and/or
+Gemini jobs through a bounded queue to a pool of worker threads. When the
+queue is full the reader blocks, so only --queue-size jobs exist at any
+moment and memory stays flat however many products the catalog holds.
+--manifest also writes manifest.json, which means keeping one entry
+(LQIP included) per image in memory until the end. Bad rows, including
+ones that are not valid UTF-8, are reported and skipped. Progress,
+throughput and resident memory are printed every few seconds.
+
+Catalog columns (CSV header or JSONL keys):
+    name     product name or SKU (required; slugified for the filename)
+    sizes    "200x200 400x400" (CSV, space/comma/semicolon separated) or a list (JSONL)
+    prompt   Gemini prompt (required for the product kind)
+    palette  "tech" or "silly" placeholder palette (default: tech)
+
+Usage: python ingest_catalog.py catalog.csv [--kinds placeholder product] [--workers 8] [--bundle FILE] [--manifest]
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import queue
+import re
+import resource
+import sys
+import threading
+import time
+
+from asset_catalog import product_outputs
+from asset_jobs import run_job
+from image_manifest import ManifestSet
+
+INGEST_KINDS = ["placeholder", "product"]
+DEFAULT_SIZES = ["200x200"]
+SIZE_PATTERN = re.compile(r"^\d+x\d+$")
+
+# Tells the workers the reader has finished
+_DONE = object()
+
+def slugify(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+def _parse_sizes(value):
+    if not value:
+        return DEFAULT_SIZES
+    if isinstance(value, str):
+        value = re.split(r"[\s,;]+", value.strip())
+    if not isinstance(value, list):
+        raise ValueError(f"sizes must be a string or a list, not {value!r}")
+    sizes = [s for s in value if s]
+    bad = [str(s) for s in sizes if not isinstance(s, str) or not SIZE_PATTERN.match(s)]
+    if bad:
+        raise ValueError(f"bad size(s) {', '.join(bad)}")
+    return sizes
+
+def _rows(path):
+    """Raw catalog rows, so read_catalog can skip a bad one and carry on
+
+    JSONL lines are yielded as undecoded bytes. CSV rows are dicts whose
+    undecodable bytes are kept as surrogates, and a row the csv module
+    cannot parse is yielded as its csv.Error.
+    """
+    if path.endswith((".jsonl", ".ndjson")):
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+        return
+    with open(path, newline="", encoding="utf-8", errors="surrogateescape") as f:
+        reader = csv.DictReader(f)
+        while True:
+            try:
+                yield next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield e
+
+def _check_utf8(row):
+    """Raise UnicodeDecodeError for a CSV value read from invalid UTF-8"""
+    for value in row.values():
+        if isinstance(value, str):
+            value.encode("utf-8", "surrogateescape").decode("utf-8")
+
+def read_catalog(path, report=print):
+    """Yield one product dict per catalog row, lazily; bad rows are reported and skipped"""
+    for number, row in enumerate(_rows(path), start=1):
+        try:
+            if isinstance(row, csv.Error):
+                raise row
+            if isinstance(row, bytes):
+                row = json.loads(row.decode("utf-8"))
+            else:
+                _check_utf8(row)
+            if not isinstance(row, dict):
+                raise ValueError(f"expected an object, got {type(row).__name__}")
+            name = slugify(str(row.get("name") or row.get("sku") or ""))
+            if not name:
+                raise ValueError("no name")
+            sizes = _parse_sizes(row.get("sizes"))
+        except (ValueError, csv.Error) as e:
+            # json.JSONDecodeError and UnicodeDecodeError are ValueErrors
+            report(f"✗ Row {number}: {e}")
+            continue
+        yield {
+            "name": name,
+            "sizes": sizes,
+            "prompt": row.get("prompt") or "",
+            "palette": row.get("palette") or "tech",
+        }
+
+def catalog_jobs(products, kinds, svg=False, skip_existing=False):
+    """Job dicts (as in asset_jobs) for each product, in catalog order
+
+    Both kinds write the same file names, so with both selected a product
+    gets a Gemini photo if it has a prompt and a placeholder otherwise.
+    Rerun with --kinds placeholder --skip-existing to fill in failed photos.
+    """
+    for product in products:
+        name = product["name"]
+        photo = "product" in kinds and product["prompt"]
+        if "placeholder" in kinds and not photo:
+            for size, output in product_outputs(name, product["sizes"], svg):
+                if not (skip_existing and os.path.exists(output)):
+                    yield {"kind": "placeholder", "output": output, "args": [name, size, product["palette"]]}
+        if photo:
+            for size, output in product_outputs(name, product["sizes"]):
+                if not (skip_existing and os.path.exists(output)):
+                    yield {"kind": "product", "output": output, "args": [product["prompt"], size]}
+
+def _rss():
+    """Current resident set size in bytes (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class Progress:
+    """Counters shared by the workers, plus the periodic report"""
+
+    def __init__(self, report):
+        self.report = report
+        self.done = 0
+        self.failed = 0
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._last = (self.start, 0)
+
+    def finished(self, ok):
+        with self._lock:
+            if ok:
+                self.done += 1
+            else:
+                self.failed += 1
+
+    def tick(self, queued):
+        now = time.perf_counter()
+        with self._lock:
+            completed = self.done + self.failed
+            last_time, last_completed = self._last
+            self._last = (now, completed)
+        rate = (completed - last_completed) / max(now - last_time, 1e-9)
+        overall = completed / max(now - self.start, 1e-9)
+        self.report(f"  {self.done} done, {self.failed} failed, {queued} queued | "
+                    f"{rate:.1f} jobs/s now, {overall:.1f} avg | RSS {_rss() / 2**20:.0f} MiB")
+
+def _worker(jobs, progress, log, manifest):
+    while True:
+        job = jobs.get()
+        if job is _DONE:
+            return
+        try:
+            run_job(job, manifest)
+            progress.finished(True)
+        except Exception as e:
+            progress.finished(False)
+            log(f"✗ {job['output']}: {e}")
+
+def ingest(jobs, workers=4, queue_size=64, report_every=5.0, report=print, manifest=None):
+    """Run jobs from any iterable through a bounded queue; returns the Progress counters
+
+    Every image written is recorded in manifest (a ManifestSet shared by
+    the workers) if one is given; saving it is up to the caller.
+    """
+    pending = queue.Queue(maxsize=queue_size)
+    progress = Progress(report)
+    threads = [threading.Thread(target=_worker, args=(pending, progress, report, manifest), daemon=True)
+               for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    stop = threading.Event()
+
+    def reporter():
+        while not stop.wait(report_every):
+            progress.tick(pending.qsize())
+
+    ticker = threading.Thread(target=reporter, daemon=True)
+    ticker.start()
+
+    try:
+        for job in jobs:
+            # Blocks while the queue is full: the reader never gets ahead of the workers
+            pending.put(job)
+    finally:
+        for _ in threads:
+            pending.put(_DONE)
+        for thread in threads:
+            thread.join()
+        stop.set()
+        ticker.join()
+
+    progress.tick(0)
+    return progress
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a CSV/JSONL product catalog into the generators")
+    parser.add_argument("catalog", help="catalog export (.csv, or .jsonl/.ndjson)")
+    parser.add_argument("--kinds", nargs="+", choices=INGEST_KINDS, default=["placeholder"],
+                        help="placeholder images, Gemini product photos, or both (default: placeholder)")
+    parser.add_argument("--workers", type=int, default=4, help="worker threads (default: 4)")
+    parser.add_argument("--queue-size", type=int, default=64, help="jobs buffered ahead of the workers (default: 64)")
+    parser.add_argument("--report-every", type=float, default=5.0, help="seconds between progress lines (default: 5)")
+    parser.add_argument("--svg", action="store_true", help="one SVG placeholder per product instead of a PNG per size")
+    parser.add_argument("--skip-existing", action="store_true", help="skip outputs that already exist (resume a run)")
+    parser.add_argument("--bundle", metavar="FILE", help="append every image to one asset bundle instead of files")
+    parser.add_argument("--manifest", action="store_true",
+                        help="also write manifest.json (holds every image's entry in memory until the end)")
+    parser.add_argument("--verbose", action="store_true", help="print a line for every file written")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print(f"INGESTING {args.catalog} ({', '.join(args.kinds)})")
+    print("=" * 60)
+
+    if "product" in args.kinds:
+        from generate_silly_products import configure_transport, get_client
+        configure_transport(concurrency=args.workers)  # One pooled connection per worker
+        get_client()  # Fail fast without an API key
+
+    out = sys.stdout
+
+    def report(line):
+        print(line, file=out, flush=True)
+
+    jobs = catalog_jobs(read_catalog(args.catalog, report), args.kinds, svg=args.svg,
+                        skip_existing=args.skip_existing)
+
+    with contextlib.ExitStack() as stack:
+        if args.bundle:
+            from asset_bundle import BundleWriter
+            from image_manifest import bundle_outputs
+            stack.enter_context(bundle_outputs(stack.enter_context(BundleWriter(args.bundle))))
+        manifest = ManifestSet() if args.manifest else None
+
+        # The generators print per file; at catalog scale only the progress lines are useful
+        with open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(out if args.verbose else devnull):
+            progress = ingest(jobs, workers=args.workers, queue_size=args.queue_size,
+                              report_every=args.report_every, report=report, manifest=manifest)
+
+        elapsed = time.perf_counter() - progress.start
+        print(f"\nCompleted {progress.done} jobs ({progress.failed} failed) in {elapsed:.1f}s")
+        if manifest is not None:
+            manifest.save()
+    if args.bundle:
+        from asset_bundle import print_summary
+        print_summary(args.bundle)
+
+    if "product" in args.kinds:
+        from generate_silly_products import telemetry
+        telemetry.report()
+        telemetry.export("gemini-telemetry")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Run generator jobs in a process pool without exceeding a memory budget
+
+The budget covers the whole batch: this process, every worker in the pool
+(busy or idle, since the pool starts them all up front) and the extra
+memory each running job needs on top of a worker's baseline. The pool is
+shrunk until the idle processes fit, and jobs are only admitted while the
+estimates of everything in flight still fit. Workers report the peak RSS
+they actually hit for every job so the estimates can be checked against
+reality, and send back each image's manifest entry so manifest.json is
+written once, by this process, to match the images just rendered.
+
+Usage: python memory_budget.py --budget 1G --workers 8 [--kinds portfolio backdrop]
+"""
+import argparse
+import contextlib
+import ctypes
+import io
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from asset_jobs import JOB_KINDS, build_jobs, job_size, run_job
+from image_manifest import ManifestSet
+
+# Fallback resident size of an idle process with numpy, Pillow and the generators
+# imported; run_with_budget measures the real figure on a warmed-up process
+WORKER_BASELINE = 48 * 1024 * 1024
+
+# Fixed cost of any job on top of the baseline: encoder buffers, plus the
+# fonts and masks a worker keeps cached between jobs. Measured at 3.6-4.1 MiB
+# for the smallest canvases on a worker that has already run other jobs,
+# so 6 MiB leaves room for the caches to grow
+JOB_OVERHEAD = 6 * 1024 * 1024
+
+# Peak bytes per canvas pixel above baseline + overhead, measured on warmed-up
+# workers and rounded up by ~10%. Roughly:
+#   avatar: RGBA canvas plus the encoded copy
+#   placeholder: RGB base + RGB top + the cached L mask and its ramp array
+#   feature: the same gradient, plus the encode buffers and its large title font
+#   portfolio: the same gradient plus RGBA overlay, RGBA copy and composite per rectangle
+#   backdrop: RGB canvas, RGBA rain layers and alpha_composite temporaries
+BYTES_PER_PIXEL = {
+    "avatar": 14,
+    "placeholder": 12,
+    "portfolio": 30,
+    "feature": 24,
+    "backdrop": 24,
+}
+
+# Each worker's manifest entries; the parent merges them and writes the files
+_manifest = None
+
+UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+def parse_bytes(text):
+    """'512M' -> 536870912"""
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+def job_bytes(job):
+    """Estimated memory a job needs on top of its worker's baseline"""
+    width, height = job_size(job)
+    return JOB_OVERHEAD + width * height * BYTES_PER_PIXEL[job["kind"]]
+
+def estimate_peak_bytes(job, baseline=WORKER_BASELINE):
+    """Estimated peak RSS of a worker while it renders this job"""
+    return baseline + job_bytes(job)
+
+def _reset_peak_rss():
+    """Reset the kernel's high-water mark so it covers only the next job (Linux)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def _current_rss():
+    """Resident size of this process right now (Linux), else its lifetime peak"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _peak_rss():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is in KiB on Linux and covers the worker's whole lifetime
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _warm_worker():
+    """Pool initializer: import what the jobs use, so the baseline already includes it"""
+    import numpy  # noqa: F401
+    import PIL.Image  # noqa: F401
+    import generate_avatars_and_more  # noqa: F401
+    import generate_placeholders  # noqa: F401
+    import image_manifest  # noqa: F401
+
+def _worker_baseline():
+    """Peak RSS of a warmed-up worker that has rendered nothing yet"""
+    return _peak_rss()
+
+def _release_memory():
+    """Hand memory freed by the last job back to the OS
+
+    Without this a worker stays at the high-water mark of the largest job
+    it has run, and every later job starts from there instead of from the
+    baseline.
+    """
+    from PIL import Image
+    Image.core.clear_cache()
+    try:
+        ctypes.CDLL(None).malloc_trim(0)  # glibc only
+    except (OSError, AttributeError):
+        pass
+
+def _run_measured(job):
+    """Worker entry point: render one job and report its peak RSS and manifest entry"""
+    global _manifest
+    if _manifest is None:
+        _manifest = ManifestSet()
+    _release_memory()
+    per_job = _reset_peak_rss()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_job(job, _manifest)
+    return {
+        "output": job["output"],
+        "seconds": time.perf_counter() - start,
+        "peak_rss": _peak_rss(),
+        "per_job": per_job,
+        "manifest": _manifest.get(job["output"]),
+    }
+
+def pool_size(jobs, budget, workers, parent, baseline):
+    """Largest pool, up to `workers`, whose processes fit the budget while each runs the smallest job"""
+    smallest = min((job_bytes(job) for job in jobs), default=JOB_OVERHEAD)
+    fits = (budget - parent) // (baseline + smallest)
+    return max(1, min(workers, fits, len(jobs) or 1))
+
+def run_with_budget(jobs, budget, workers=4, report=print, manifest=None):
+    """Render jobs with at most `workers` processes and `budget` estimated bytes in total
+
+    This process and every pool worker are charged their resident size for
+    the whole run; each running job is charged its job_bytes() on top.
+    Jobs are admitted in order; when the next one does not fit, later jobs
+    that do fit are backfilled. A job larger than the whole budget runs
+    on its own. Entries for the images rendered are put() into manifest if
+    given. Returns the per-job results.
+    """
+    running = {}
+    results = []
+    in_flight = 0
+    max_in_flight = 0
+
+    # Workers are forked from this process, so warm it first: its RSS is
+    # then what every idle worker costs before it renders anything
+    _warm_worker()
+    parent = _current_rss()
+    size = pool_size(jobs, budget, workers, parent, parent)
+    if size < workers:
+        report(f"Using {size} of {workers} workers so their baselines fit the budget")
+
+    with ProcessPoolExecutor(max_workers=size, initializer=_warm_worker) as pool:
+        baseline = max(parent, pool.submit(_worker_baseline).result())
+        fixed = parent + size * baseline
+        report(f"Worker baseline: {baseline / 2**20:.1f} MiB; this process and {size} worker(s): "
+               f"{fixed / 2**20:.1f} MiB")
+        if fixed > budget:
+            report(f"✗ {fixed / 2**20:.1f} MiB of processes alone exceed the budget; running one job at a time")
+        pending = [(job, job_bytes(job)) for job in jobs]
+        while pending or running:
+            i = 0
+            while i < len(pending) and len(running) < size:
+                job, extra = pending[i]
+                if fixed + in_flight + extra <= budget or not running:
+                    pending.pop(i)
+                    running[pool.submit(_run_measured, job)] = (job, extra)
+                    in_flight += extra
+                    max_in_flight = max(max_in_flight, fixed + in_flight)
+                else:
+                    i += 1
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job, extra = running.pop(future)
+                in_flight -= extra
+                estimate = baseline + extra
+                try:
+                    result = future.result()
+                except Exception as e:
+                    report(f"✗ {job['output']}: {e}")
+                    continue
+                result.update(kind=job["kind"], estimate=estimate)
+                if manifest is not None and result["manifest"]:
+                    manifest.put(job["output"], result["manifest"])
+                results.append(result)
+                over = " (over estimate!)" if result["peak_rss"] > estimate else ""
+                report(f"✓ {job['output']}: peak {result['peak_rss'] / 2**20:.1f} MiB, "
+                       f"est {estimate / 2**20:.1f} MiB, {result['seconds']:.2f}s{over}")
+
+    report(f"\nPeak estimated memory (processes + jobs in flight): {max_in_flight / 2**20:.1f} MiB "
+           f"of {budget / 2**20:.1f} MiB budget")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-generate assets within a memory budget")
+    parser.add_argument("--budget", default="1G", help="total memory for this process, its workers and their jobs, e.g. 512M, 2G")
+    parser.add_argument("--workers", type=int, default=4, help="maximum worker processes")
+    parser.add_argument("--kinds", nargs="+", choices=JOB_KINDS, default=JOB_KINDS)
+    args = parser.parse_args()
+
+    budget = parse_bytes(args.budget)
+    jobs = build_jobs(args.kinds)
+
+    print("=" * 60)
+    print(f"GENERATING {len(jobs)} ASSETS WITH A {args.budget} BUDGET")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    manifest = ManifestSet()
+    results = run_with_budget(jobs, budget, workers=args.workers, manifest=manifest)
+    manifest.save()
+
+    print(f"Completed {len(results)}/{len(jobs)} jobs in {time.perf_counter() - start:.1f}s")
+    if results and not all(r["per_job"] for r in results):
+        print("Note: per-job peak RSS is unavailable here; figures are per-worker lifetime peaks")
+
+if __name__ == "__main__":
+    main()
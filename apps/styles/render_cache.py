@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Process-wide caches for fonts and gradient masks
+
+These live in their own module so a long-running process (see
+watch_assets.py) can reload the generators without losing what is warm.
+"""
+import contextlib
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageFont
+
+# Set by pinned_fonts(): ignore the requested font files and use Pillow's own
+_pinned = False
+
+def load_font(path, size):
+    """TrueType font at size, or Pillow's default font at the same size if it cannot be loaded
+
+    The fallback has to be the requested size: SVG layouts are measured with
+    this font but declare font-size, so a smaller stand-in would wrap and
+    center text for glyphs much smaller than the ones browsers draw.
+    """
+    return _load_font(path, size, _pinned)
+
+@lru_cache(maxsize=None)
+def _load_font(path, size, pinned):
+    if not pinned:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            pass
+    return ImageFont.load_default(size)
+
+@contextlib.contextmanager
+def pinned_fonts():
+    """Load Pillow's bundled font for every path until the block exits
+
+    Renders then look the same whichever fonts the machine has installed,
+    which is what golden images need.
+    """
+    global _pinned
+    previous, _pinned = _pinned, True
+    try:
+        yield
+    finally:
+        _pinned = previous
+
+@lru_cache(maxsize=64)
+def gradient_mask(width, height, direction):
+    """'L' mask ramping 0..255 left-to-right, top-to-bottom or along the diagonal
+
+    Same values as the per-pixel int(255 * t) loops it replaces. The mask is
+    shared between callers, so only ever read it (e.g. as a paste mask).
+    """
+    x = np.arange(width)[None, :]
+    y = np.arange(height)[:, None]
+    if direction == 'horizontal':
+        t = np.broadcast_to(x / width, (height, width))
+    elif direction == 'vertical':
+        t = np.broadcast_to(y / height, (height, width))
+    elif direction == 'diagonal':
+        t = (x + y) / (width + height)
+    else:
+        raise ValueError(f"Unknown gradient direction: {direction}")
+    return Image.fromarray((255 * t).astype(np.uint8), 'L')
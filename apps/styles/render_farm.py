@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Render asset jobs on any number of worker processes through a work queue
+
+The coordinator enqueues jobs from the generators; workers, started in
+any number of processes on the same host, lease jobs one at a time,
+render them with asset_jobs.run_job and report back. The SQLite queue
+that ships is single-host only: it must not live on a network
+filesystem. A worker keeps its lease alive while it renders; if it
+dies, the lease runs out and another worker picks the job up; until
+then the other workers keep waiting rather than idling out.
+
+Each coordinator run renders every job again, including ones a previous
+run finished; --resume keeps those and only renders what is left.
+Workers send each image's manifest entry back with its result, and the
+coordinator writes the manifest.json files once the queue drains (or run
+`manifest` after a --no-wait coordinator), so processes never race on them.
+
+    python render_farm.py coordinator --workers 4          # enqueue, start 4 local workers, wait
+    python render_farm.py coordinator --backdrop-seeds 42 7 99 --no-wait
+    python render_farm.py coordinator --resume              # finish an interrupted run
+    python render_farm.py worker                            # join from another shell
+    python render_farm.py status
+    python render_farm.py manifest                          # write manifest.json from finished jobs
+
+Workers write outputs relative to their working directory, so every
+worker must run from the same app directory.
+"""
+import argparse
+import contextlib
+import io
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from asset_jobs import JOB_KINDS, build_jobs, run_job
+from image_manifest import ManifestSet
+from work_queue import open_queue
+
+DEFAULT_QUEUE = "render-queue.db"
+LEASE_SECONDS = 60
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def _keep_leased(queue, id, worker, lease, stop):
+    """Renew the lease every third of its length until the job finishes"""
+    while not stop.wait(lease / 3):
+        if not queue.heartbeat(id, worker, lease):
+            return
+
+def work(queue, lease=LEASE_SECONDS, idle_exit=5.0, poll=0.5, report=print):
+    """Claim and render jobs until the queue has been empty for idle_exit seconds (0: forever)
+
+    Jobs leased to other workers keep this one waiting: if their worker
+    dies, someone has to be around to claim them when the lease expires.
+    """
+    name = worker_name()
+    manifest = ManifestSet()
+    done = failed = 0
+    idle_since = time.monotonic()
+
+    while True:
+        claimed = queue.claim(name, lease)
+        if claimed is None:
+            counts = queue.counts()
+            if counts.get("pending") or counts.get("leased") or counts.get("expired"):
+                idle_since = time.monotonic()
+            elif idle_exit and time.monotonic() - idle_since > idle_exit:
+                break
+            time.sleep(poll)
+            continue
+
+        id, job = claimed
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=_keep_leased, args=(queue, id, name, lease, stop), daemon=True)
+        heartbeat.start()
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_job(job, manifest)
+        except Exception as e:
+            queue.fail(id, name, f"{type(e).__name__}: {e}")
+            failed += 1
+            report(f"✗ {job['output']}: {e}")
+        else:
+            seconds = time.perf_counter() - start
+            queue.complete(id, name, {"seconds": round(seconds, 3), "bytes": os.path.getsize(job["output"]),
+                                      "manifest": manifest.get(job["output"])})
+            done += 1
+            report(f"✓ {job['output']} ({seconds:.2f}s)")
+        finally:
+            stop.set()
+            heartbeat.join()
+        idle_since = time.monotonic()
+
+    report(f"Worker {name}: {done} rendered, {failed} failed")
+    return done, failed
+
+def print_status(queue):
+    counts = queue.counts()
+    total = sum(counts.values())
+    print(f"{counts.get('done', 0)}/{total} done, {counts.get('pending', 0)} pending, "
+          f"{counts.get('leased', 0)} leased, {counts.get('expired', 0)} expired leases, "
+          f"{counts.get('failed', 0)} failed")
+    return counts
+
+def wait_for(queue, interval=2.0):
+    """Report progress until nothing is pending or leased"""
+    while True:
+        counts = print_status(queue)
+        if not counts.get("pending") and not counts.get("leased") and not counts.get("expired"):
+            return counts
+        time.sleep(interval)
+
+def write_manifests(queue, jobs=None):
+    """Merge the manifest entries of finished jobs (only those in jobs, if given) into the manifest.json files"""
+    outputs = None if jobs is None else {job["output"] for job in jobs}
+    manifest = ManifestSet()
+    for job, result in queue.results():
+        if outputs is not None and job["output"] not in outputs:
+            continue
+        if result.get("manifest"):
+            manifest.put(job["output"], result["manifest"])
+    manifest.save()
+
+def spawn_workers(count, queue_url, lease):
+    """Start local worker processes, exiting once the queue drains"""
+    command = [sys.executable, os.path.abspath(__file__), "worker", "--queue", queue_url, "--lease", str(lease)]
+    return [subprocess.Popen(command, stdout=subprocess.DEVNULL) for _ in range(count)]
+
+def cmd_coordinator(args):
+    queue = open_queue(args.queue)
+    jobs = build_jobs(args.kinds, svg=args.svg, backdrop_seeds=args.backdrop_seeds)
+    added = queue.enqueue(jobs, requeue=not args.resume)
+    kept = "already queued or done" if args.resume else "already pending or leased"
+
+    print("=" * 60)
+    print(f"QUEUED {added} JOBS ({len(jobs) - added} {kept}) IN {args.queue}")
+    print("=" * 60)
+
+    counts = queue.counts()
+    outstanding = counts.get("pending") or counts.get("leased") or counts.get("expired")
+    workers = spawn_workers(args.workers, args.queue, args.lease) if args.workers and outstanding else []
+    if args.no_wait:
+        return
+
+    start = time.perf_counter()
+    counts = wait_for(queue)
+    for process in workers:
+        process.wait()
+
+    print(f"\nFinished in {time.perf_counter() - start:.1f}s")
+    write_manifests(queue, jobs)
+    for job, error in queue.failures():
+        print(f"✗ {job['output']}: {error}")
+    if counts.get("failed"):
+        sys.exit(1)
+
+def cmd_worker(args):
+    work(open_queue(args.queue), lease=args.lease, idle_exit=args.idle_exit)
+
+def cmd_status(args):
+    queue = open_queue(args.queue)
+    print_status(queue)
+    for job, error in queue.failures():
+        print(f"✗ {job['output']}: {error}")
+
+def cmd_manifest(args):
+    write_manifests(open_queue(args.queue))
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Distributed rendering of the generator assets")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_queue(p):
+        p.add_argument("--queue", default=DEFAULT_QUEUE,
+                       help=f"queue URL or SQLite path (default: {DEFAULT_QUEUE})")
+
+    p = sub.add_parser("coordinator", help="enqueue jobs and wait for the workers to finish them")
+    add_queue(p)
+    p.add_argument("--kinds", nargs="+", choices=JOB_KINDS, default=JOB_KINDS)
+    p.add_argument("--svg", action="store_true", help="SVG avatars, placeholders and features")
+    p.add_argument("--backdrop-seeds", nargs="+", type=int, default=[42],
+                   help="one backdrop still per seed (default: 42)")
+    p.add_argument("--workers", type=int, default=0, help="also start this many local workers")
+    p.add_argument("--lease", type=float, default=LEASE_SECONDS, help="lease length for spawned workers")
+    p.add_argument("--no-wait", action="store_true", help="return as soon as the jobs are queued")
+    p.add_argument("--resume", action="store_true",
+                   help="keep jobs a previous run finished or gave up on instead of rendering them again")
+    p.set_defaults(func=cmd_coordinator)
+
+    p = sub.add_parser("worker", help="claim and render jobs")
+    add_queue(p)
+    p.add_argument("--lease", type=float, default=LEASE_SECONDS,
+                   help=f"seconds a claimed job stays ours without a heartbeat (default: {LEASE_SECONDS})")
+    p.add_argument("--idle-exit", type=float, default=5.0,
+                   help="exit after the queue has been empty this long; 0 to keep waiting (default: 5)")
+    p.set_defaults(func=cmd_worker)
+
+    p = sub.add_parser("status", help="job counts and failures")
+    add_queue(p)
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("manifest", help="write manifest.json files from the finished jobs")
+    add_queue(p)
+    p.set_defaults(func=cmd_manifest)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Watch the generators and re-render only the assets whose inputs changed
+
+Keeps one Python process alive so Pillow, fonts and gradient masks
+(render_cache) stay loaded. When a generator script or the asset catalog
+is saved, those modules are reloaded and every job is fingerprinted from
+its arguments, the palette/theme it uses and the source of the functions
+that draw it. Only jobs whose fingerprint moved are rendered again.
+
+Each job is seeded from its output path, so an untouched asset renders
+identically on every pass and is never rewritten.
+
+Usage: python watch_assets.py [--svg] [--kinds placeholder portfolio] [--interval 0.2]
+"""
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import random
+import time
+from pathlib import Path
+
+import asset_catalog
+import asset_jobs
+import generate_avatars_and_more
+import generate_placeholders
+from image_manifest import ManifestSet
+
+# Reloaded in this order: the catalog first, since the others import from it
+WATCHED_MODULES = [asset_catalog, asset_jobs, generate_placeholders, generate_avatars_and_more]
+
+WATCH_KINDS = ["avatar", "placeholder", "portfolio", "feature"]
+
+# Functions whose source feeds each kind of asset
+RENDER_FUNCTIONS = {
+    "placeholder": (generate_placeholders, ["create_gradient_image", "wrap_text", "placeholder_layout",
+                                            "render_placeholder", "render_placeholder_svg", "generate_placeholder"]),
+    "avatar": (generate_avatars_and_more, ["avatar_color", "avatar_layout", "svg_text", "render_avatar",
+                                           "render_avatar_svg", "generate_avatar"]),
+    "portfolio": (generate_avatars_and_more, ["render_portfolio_image", "generate_portfolio_image"]),
+    "feature": (generate_avatars_and_more, ["feature_layout", "svg_text", "render_feature_image",
+                                            "render_feature_image_svg", "generate_feature_image"]),
+}
+
+def job_config(job):
+    """The palette, theme or color table a job draws from"""
+    kind, args = job["kind"], job["args"]
+    if kind == "placeholder":
+        return generate_placeholders.PALETTES[args[2]]
+    if kind == "portfolio":
+        return generate_avatars_and_more.PORTFOLIO_THEMES[args[2]]
+    if kind == "feature":
+        return generate_avatars_and_more.FEATURE_COLORS
+    return None
+
+def fingerprint(job, sources):
+    """Hash of everything that decides what a job renders"""
+    module, names = RENDER_FUNCTIONS[job["kind"]]
+    h = hashlib.sha256(json.dumps([job, job_config(job)], sort_keys=True).encode())
+    for name in names:
+        h.update(sources[module.__name__, name])
+    return h.hexdigest()
+
+def function_sources():
+    """Source of every render function, read once per pass"""
+    sources = {}
+    for module, names in RENDER_FUNCTIONS.values():
+        for name in names:
+            sources[module.__name__, name] = inspect.getsource(getattr(module, name)).encode()
+    return sources
+
+def reload_modules():
+    """Re-execute the watched modules in place; render_cache and friends stay warm"""
+    for module in WATCHED_MODULES:
+        importlib.reload(module)
+
+def source_mtimes():
+    return {module.__file__: Path(module.__file__).stat().st_mtime_ns for module in WATCHED_MODULES}
+
+def render_changed(kinds, svg, seen):
+    """Render jobs whose fingerprint is new; seen maps output -> fingerprint and is updated"""
+    jobs = asset_jobs.build_jobs(kinds, svg=svg)
+    sources = function_sources()
+    manifest = ManifestSet()
+    rendered = 0
+
+    for job in jobs:
+        key = fingerprint(job, sources)
+        if seen.get(job["output"]) == key:
+            continue
+        random.seed(job["output"])
+        try:
+            asset_jobs.run_job(job, manifest)
+        except Exception as e:
+            print(f"✗ {job['output']}: {e}")
+            continue
+        seen[job["output"]] = key
+        rendered += 1
+
+    if rendered:
+        manifest.save()
+    return rendered, len(jobs)
+
+def watch(kinds=None, svg=False, interval=0.2):
+    kinds = kinds or WATCH_KINDS
+    seen = {}
+
+    print("=" * 60)
+    print("WATCHING GENERATORS (Ctrl+C to stop)")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    rendered, total = render_changed(kinds, svg, seen)
+    print(f"\nInitial pass: {rendered}/{total} assets in {time.perf_counter() - start:.2f}s\n")
+
+    mtimes = source_mtimes()
+    while True:
+        time.sleep(interval)
+        current = source_mtimes()
+        if current == mtimes:
+            continue
+        mtimes = current
+
+        start = time.perf_counter()
+        try:
+            reload_modules()
+        except Exception as e:
+            # Usually a half-saved file; wait for the next save
+            print(f"✗ Reload failed: {e}")
+            continue
+        rendered, total = render_changed(kinds, svg, seen)
+        print(f"Re-rendered {rendered}/{total} assets in {(time.perf_counter() - start) * 1000:.0f}ms\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate assets as the generator scripts change")
+    parser.add_argument("--kinds", nargs="+", choices=WATCH_KINDS, default=WATCH_KINDS)
+    parser.add_argument("--svg", action="store_true", help="watch the SVG outputs instead of PNGs")
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between checks (default: 0.2)")
+    args = parser.parse_args()
+
+    try:
+        watch(args.kinds, svg=args.svg, interval=args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+if __name__ == "__main__":
+    main()
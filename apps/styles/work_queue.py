@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Work queues for distributing asset jobs to worker processes
+
+A queue hands out leases: a claimed job belongs to one worker until its
+lease expires, after which any worker may claim it again. Jobs are keyed
+by a hash of their JSON, so enqueueing a job that is still pending or
+leased is a no-op, and a job that is delivered twice just renders the
+same file twice (outputs are written atomically, so readers never see a
+partial file). A finished or failed job is only queued again when asked
+to (requeue=True), which is how a new run renders it again.
+
+open_queue() picks a backend from a URL. Only SQLite ships here, which
+covers any number of workers on one machine: SQLite's locking is not
+reliable on network filesystems, so it cannot be shared between hosts.
+Another backend only needs to implement the WorkQueue methods and be
+added to BACKENDS.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+# Deliveries before a job that keeps failing is given up on
+MAX_ATTEMPTS = 3
+
+def job_id(job):
+    return hashlib.sha256(json.dumps(job, sort_keys=True).encode()).hexdigest()[:32]
+
+class WorkQueue:
+    """Interface every queue backend implements"""
+
+    def enqueue(self, jobs, requeue=False):
+        """Add jobs not already queued; returns how many were added
+
+        With requeue, jobs already done or failed go back to pending with
+        their attempts reset, and count as added.
+        """
+        raise NotImplementedError
+
+    def claim(self, worker, lease):
+        """Lease the next pending or expired job to worker for lease seconds; (id, job) or None"""
+        raise NotImplementedError
+
+    def heartbeat(self, id, worker, lease):
+        """Extend worker's lease on a job; False if it no longer holds it"""
+        raise NotImplementedError
+
+    def complete(self, id, worker, result):
+        raise NotImplementedError
+
+    def fail(self, id, worker, error):
+        """Record a failure; the job goes back to pending until it runs out of attempts"""
+        raise NotImplementedError
+
+    def counts(self):
+        """{state: number of jobs}"""
+        raise NotImplementedError
+
+    def failures(self):
+        """[(job, error)] for jobs that ran out of attempts"""
+        raise NotImplementedError
+
+    def results(self):
+        """[(job, result)] for finished jobs"""
+        raise NotImplementedError
+
+class SQLiteQueue(WorkQueue):
+    """Queue in a single SQLite file, shared by processes on one host
+
+    Claims run inside BEGIN IMMEDIATE, which takes the write lock before
+    reading, so two workers can never lease the same job.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            job TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            worker TEXT,
+            lease_until REAL,
+            error TEXT,
+            result TEXT,
+            enqueued_at REAL NOT NULL,
+            finished_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_until);
+    """
+
+    def __init__(self, path, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        # Autocommit; transactions are opened explicitly where they matter
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(self.SCHEMA)
+        # Workers heartbeat from a second thread over the same connection
+        self._lock = threading.Lock()
+
+    def enqueue(self, jobs, requeue=False):
+        now = time.time()
+        rows = [(job_id(job), json.dumps(job), now) for job in jobs]
+        insert = "INSERT INTO jobs (id, job, enqueued_at) VALUES (?, ?, ?)"
+        if requeue:
+            # Jobs still pending or leased are left to the run that has them
+            insert += (" ON CONFLICT (id) DO UPDATE SET state = 'pending', attempts = 0, worker = NULL, "
+                       "lease_until = NULL, error = NULL, result = NULL, finished_at = NULL, "
+                       "enqueued_at = excluded.enqueued_at WHERE state IN ('done', 'failed')")
+        else:
+            insert += " ON CONFLICT (id) DO NOTHING"
+        with self._lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            before = self.db.total_changes
+            self.db.executemany(insert, rows)
+            added = self.db.total_changes - before
+            self.db.execute("COMMIT")
+        return added
+
+    def claim(self, worker, lease):
+        now = time.time()
+        with self._lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                # A job whose worker keeps dying (e.g. OOM-killed) stops being redelivered
+                self.db.execute(
+                    "UPDATE jobs SET state = 'failed', error = 'lease expired', finished_at = ? "
+                    "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+                    (now, now, self.max_attempts))
+                row = self.db.execute(
+                    "SELECT id, job FROM jobs WHERE state = 'pending' "
+                    "OR (state = 'leased' AND lease_until < ?) ORDER BY enqueued_at, rowid LIMIT 1",
+                    (now,)).fetchone()
+                if row:
+                    self.db.execute(
+                        "UPDATE jobs SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                        "WHERE id = ?", (worker, now + lease, row[0]))
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return (row[0], json.loads(row[1])) if row else None
+
+    def heartbeat(self, id, worker, lease):
+        with self._lock:
+            cursor = self.db.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                (time.time() + lease, id, worker))
+        return cursor.rowcount == 1
+
+    def complete(self, id, worker, result):
+        # Whoever finishes first wins; a redelivered copy rendered the same file
+        with self._lock:
+            self.db.execute(
+                "UPDATE jobs SET state = 'done', worker = ?, result = ?, error = NULL, finished_at = ? "
+                "WHERE id = ? AND state != 'done'",
+                (worker, json.dumps(result), time.time(), id))
+
+    def fail(self, id, worker, error):
+        with self._lock:
+            self.db.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_until = NULL, finished_at = ? "
+                "WHERE id = ? AND worker = ? AND state = 'leased'",
+                (self.max_attempts, error, time.time(), id, worker))
+
+    def counts(self):
+        now = time.time()
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT CASE WHEN state = 'leased' AND lease_until < ? THEN 'expired' ELSE state END, COUNT(*) "
+                "FROM jobs GROUP BY 1", (now,)).fetchall()
+        return dict(rows)
+
+    def failures(self):
+        with self._lock:
+            rows = self.db.execute("SELECT job, error FROM jobs WHERE state = 'failed' ORDER BY rowid").fetchall()
+        return [(json.loads(job), error) for job, error in rows]
+
+    def results(self):
+        with self._lock:
+            rows = self.db.execute("SELECT job, result FROM jobs WHERE state = 'done' ORDER BY rowid").fetchall()
+        return [(json.loads(job), json.loads(result)) for job, result in rows]
+
+BACKENDS = {
+    "sqlite": SQLiteQueue,
+}
+
+def open_queue(url):
+    """'sqlite:///path/to/queue.db', or just a path for SQLite"""
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        return SQLiteQueue(url)
+    if scheme not in BACKENDS:
+        raise ValueError(f"Unknown queue backend '{scheme}' (have: {', '.join(BACKENDS)})")
+    # sqlite:///abs/path -> /abs/path, sqlite://rel/path -> rel/path
+    return BACKENDS[scheme](rest)
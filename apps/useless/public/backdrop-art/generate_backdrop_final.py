@@ -6,8 +6,17 @@ Meticulously crafted with painstaking attention to every detail
 """
 
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageChops, ImageEnhance
+import argparse
+import functools
+import hashlib
+import inspect
+import json
+import mmap
+import os
 import random
 import math
+import time
+import types
 
 # Canvas dimensions
 WIDTH = 1920
@@ -38,6 +47,16 @@ PRODUCTS = [
 
 MATRIX_CHARS = "01アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモ"
 
+# Additive row tints used by the glitch bands
+GLITCH_TINTS = {
+    'r': (22, 0, 0),
+    'c': (0, 12, 18),
+    'm': (18, 0, 12),
+}
+
+OUTPUT_PATH = "/home/matt/projects/useless-io/public/backdrop-art/useless-glitch-backdrop.png"
+ANIMATION_PATH = "/home/matt/projects/useless-io/public/backdrop-art/useless-glitch-backdrop.webp"
+
 def create_base():
     """Deep void with radial gradient and noise"""
     img = Image.new('RGB', (WIDTH, HEIGHT), VOID_BLACK)
@@ -89,18 +108,18 @@ def add_scanlines(img):
 
     return img
 
-def draw_barcode(draw, x, y, w, h, color, glitch=0.2):
+def draw_barcode(draw, x, y, w, h, color, glitch=0.2, rng=random):
     """Precision barcode with controlled glitch"""
     cx = x
     while cx < x + w:
-        bar_w = random.choice([2, 2, 3, 4, 2])
-        gap = random.choice([1, 2, 1, 2])
+        bar_w = rng.choice([2, 2, 3, 4, 2])
+        gap = rng.choice([1, 2, 1, 2])
 
-        if random.random() > 0.25:
-            ox = random.randint(-6, 6) if random.random() < glitch else 0
-            bh = h if random.random() > glitch * 0.5 else int(h * random.uniform(0.75, 1.1))
+        if rng.random() > 0.25:
+            ox = rng.randint(-6, 6) if rng.random() < glitch else 0
+            bh = h if rng.random() > glitch * 0.5 else int(h * rng.uniform(0.75, 1.1))
 
-            if random.random() < 0.12:
+            if rng.random() < 0.12:
                 draw.rectangle([cx + ox + 2, y, cx + bar_w + ox + 2, y + bh], fill=(color[0], 0, 0))
                 draw.rectangle([cx + ox - 2, y, cx + bar_w + ox - 2, y + bh], fill=(0, 0, min(200, color[1] + 40)))
 
@@ -108,7 +127,7 @@ def draw_barcode(draw, x, y, w, h, color, glitch=0.2):
 
         cx += bar_w + gap
 
-def draw_cart(draw, cx, cy, size, color, corrupt=0):
+def draw_cart(draw, cx, cy, size, color, corrupt=0, rng=random):
     """Shopping cart icon with corruption"""
     body = [
         (cx - size * 0.35, cy - size * 0.15),
@@ -118,8 +137,8 @@ def draw_cart(draw, cx, cy, size, color, corrupt=0):
     ]
 
     if corrupt > 0:
-        body = [(p[0] + random.uniform(-corrupt, corrupt) * 3,
-                 p[1] + random.uniform(-corrupt, corrupt) * 2) for p in body]
+        body = [(p[0] + rng.uniform(-corrupt, corrupt) * 3,
+                 p[1] + rng.uniform(-corrupt, corrupt) * 2) for p in body]
 
     if corrupt > 0.4:
         off = int(corrupt * 3)
@@ -188,9 +207,7 @@ def create_dense_matrix(w, h, font_path):
 
 def add_glitch_bands(img, intensity=0.9):
     """Horizontal glitch displacement"""
-    pixels = img.load()
     result = img.copy()
-    rp = result.load()
 
     for _ in range(int(14 * intensity)):
         y_start = random.randint(0, HEIGHT - 1)
@@ -198,20 +215,14 @@ def add_glitch_bands(img, intensity=0.9):
         x_off = random.randint(int(-35 * intensity), int(35 * intensity))
 
         for y in range(y_start, min(y_start + band_h, HEIGHT)):
-            row = [pixels[x, y] for x in range(WIDTH)]
-            for x in range(WIDTH):
-                rp[x, y] = row[(x - x_off) % WIDTH]
+            # Rows are shifted as whole strips, always sampled from the source image
+            row = ImageChops.offset(img.crop((0, y, WIDTH, y + 1)), x_off, 0)
 
             if random.random() > 0.55:
                 tint = random.choice(['r', 'c', 'm'])
-                for x in range(WIDTH):
-                    r, g, b = rp[x, y]
-                    if tint == 'r':
-                        rp[x, y] = (min(255, r + 22), g, b)
-                    elif tint == 'c':
-                        rp[x, y] = (r, min(255, g + 12), min(255, b + 18))
-                    else:
-                        rp[x, y] = (min(255, r + 18), g, min(255, b + 12))
+                row = ImageChops.add(row, Image.new('RGB', row.size, GLITCH_TINTS[tint]))
+
+            result.paste(row, (0, y))
 
     return result
 
@@ -255,8 +266,66 @@ def add_watermark(img, font_path):
     img = img.convert('RGBA')
     return Image.alpha_composite(img, overlay).convert('RGB')
 
-def add_elements(img, pixel_font, mono_font):
-    """Commerce elements with intentional composition"""
+class StampCache:
+    """Cart and barcode sprites, drawn once and blitted wherever they recur
+
+    Sprites are keyed by quantized size, color and corruption plus one of a
+    few variants, and drawn with their own RNG seeded from that key, so the
+    same key always looks the same. The quantization is what makes repeats
+    common enough for dense layers to be mostly blits.
+    """
+
+    # Quantization steps: cart size and corruption, barcode width/height and glitch
+    CART_STEPS = (4, 0.2)
+    BARCODE_STEPS = (32, 12, 0.15)
+
+    def __init__(self, variants=2):
+        self.variants = variants
+        self.sprites = {}
+        self.blits = 0
+
+    def _sprite(self, key, size, draw_fn):
+        if key not in self.sprites:
+            sprite = Image.new('RGBA', size, (0, 0, 0, 0))
+            draw_fn(ImageDraw.Draw(sprite), random.Random(repr(key)))
+            self.sprites[key] = sprite
+        self.blits += 1
+        return self.sprites[key]
+
+    def cart(self, img, cx, cy, size, color, corrupt=0):
+        size_step, corrupt_step = self.CART_STEPS
+        size = max(size_step, round(size / size_step) * size_step)
+        corrupt = round(round(corrupt / corrupt_step) * corrupt_step, 2)
+        # Half-extent covering the handle, wheels, jitter and ghost outlines
+        half = size // 2 + 8
+        key = ("cart", size, color, corrupt, random.randrange(self.variants))
+        sprite = self._sprite(key, (half * 2, half * 2),
+                              lambda d, rng: draw_cart(d, half, half, size, color, corrupt, rng))
+        img.paste(sprite, (cx - half, cy - half), sprite)
+
+    def barcode(self, img, x, y, w, h, color, glitch=0.2):
+        """Blit a barcode; returns its quantized (w, h)"""
+        w_step, h_step, glitch_step = self.BARCODE_STEPS
+        w = max(w_step, round(w / w_step) * w_step)
+        h = max(h_step, round(h / h_step) * h_step)
+        glitch = round(round(glitch / glitch_step) * glitch_step, 2)
+        # Bars shift up to 6px plus 2px ghosts sideways and run 10% long
+        pad = 8
+        key = ("barcode", w, h, color, glitch, random.randrange(self.variants))
+        sprite = self._sprite(key, (w + pad * 2 + 4, int(h * 1.1) + 2),
+                              lambda d, rng: draw_barcode(d, pad, 0, w, h, color, glitch, rng))
+        img.paste(sprite, (x - pad, y), sprite)
+        return w, h
+
+# Methods whose source goes into the layer cache key of the elements stage
+STAMP_CODE = (StampCache._sprite, StampCache.cart, StampCache.barcode)
+
+def add_elements(img, pixel_font, mono_font, density=1, stamps=None):
+    """Commerce elements with intentional composition
+
+    density scales the number of carts and barcodes. With a StampCache they
+    are blitted from cached sprites instead of drawn one primitive at a time.
+    """
     draw = ImageDraw.Draw(img)
 
     try:
@@ -276,13 +345,16 @@ def add_elements(img, pixel_font, mono_font):
     ]
 
     for (x_range, y_range, size_range, corrupt_max, colors) in zones:
-        count = random.randint(4, 8)
+        count = round(random.randint(4, 8) * density)
         for _ in range(count):
             x = random.randint(x_range[0], x_range[1])
             y = random.randint(y_range[0], y_range[1])
             size = random.randint(size_range[0], size_range[1])
             color = random.choice(colors)
-            draw_cart(draw, x, y, size, color, corrupt=random.uniform(0, corrupt_max))
+            if stamps:
+                stamps.cart(img, x, y, size, color, corrupt=random.uniform(0, corrupt_max))
+            else:
+                draw_cart(draw, x, y, size, color, corrupt=random.uniform(0, corrupt_max))
 
     # Barcode clusters
     bc_zones = [
@@ -293,7 +365,7 @@ def add_elements(img, pixel_font, mono_font):
     ]
 
     for (x1, x2, y1, y2, count) in bc_zones:
-        for _ in range(count):
+        for _ in range(round(count * density)):
             x = random.randint(x1, x2 - 100)
             y = random.randint(y1, y2 - 45)
             w, h = random.randint(65, 130), random.randint(22, 45)
@@ -303,7 +375,10 @@ def add_elements(img, pixel_font, mono_font):
             else:
                 color = tuple(c // 2 for c in (ELECTRIC_GREEN if random.random() > 0.5 else MAGENTA))
 
-            draw_barcode(draw, x, y, w, h, color, glitch=random.uniform(0.12, 0.38))
+            if stamps:
+                w, h = stamps.barcode(img, x, y, w, h, color, glitch=random.uniform(0.12, 0.38))
+            else:
+                draw_barcode(draw, x, y, w, h, color, glitch=random.uniform(0.12, 0.38))
 
             if random.random() > 0.45:
                 label = random.choice(["$0.00", "NULL", "ERR", "N/A", "∅", "void", "#NaN", "---"])
@@ -362,64 +437,338 @@ def vignette(img, strength=0.38):
 
     return img
 
+def vignette_mask(strength=0.38):
+    """Vignette as a reusable RGB multiply layer"""
+    mask = Image.new('L', (WIDTH, HEIGHT), 255)
+    pixels = mask.load()
+    cx, cy = WIDTH // 2, HEIGHT // 2
+    max_d = math.sqrt(cx**2 + cy**2)
+
+    for y in range(HEIGHT):
+        for x in range(0, WIDTH, 2):
+            d = math.sqrt((x - cx)**2 + (y - cy)**2)
+            if d > max_d * 0.45:
+                f = (d - max_d * 0.45) / (max_d * 0.55)
+                v = int(255 * (1 - min(1, f * strength)))
+                pixels[x, y] = v
+                if x + 1 < WIDTH:
+                    pixels[x + 1, y] = v
+
+    return Image.merge('RGB', (mask, mask, mask))
+
 def polish(img):
     """Final enhancement"""
     img = ImageEnhance.Contrast(img).enhance(1.06)
     img = ImageEnhance.Sharpness(img).enhance(1.04)
     return img
 
-def main():
-    random.seed(42)  # Reproducibility
+def add_scanline_flicker(img):
+    """Top scanline overlay, redrawn per frame when animating"""
+    draw = ImageDraw.Draw(img)
+    for y in range(0, HEIGHT, 3):
+        if random.random() > 0.72:
+            draw.line([(0, y), (WIDTH, y)], fill=(0, 0, 0))
+    return img
+
+@functools.lru_cache(maxsize=None)
+def file_digest(path):
+    """sha256 of a file, or "missing" when it does not exist (the fallback font is used then)"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return "missing"
+
+def font_key(*paths):
+    """Font paths with their contents' digests, for stage parameters"""
+    return [[path, file_digest(path)] for path in paths]
+
+def _const_key(value):
+    """repr of a code constant that does not depend on hash ordering"""
+    if isinstance(value, frozenset):
+        return "frozenset(" + repr(sorted(map(_const_key, value))) + ")"
+    if isinstance(value, tuple):
+        return "(" + ", ".join(map(_const_key, value)) + ")"
+    return repr(value)
+
+def code_key(*roots):
+    """Source of every module function reachable from roots, plus the module constants they read
+
+    Follows the names each function's code (and any lambda or nested
+    function inside it) looks up, so a layer's key changes when a helper it
+    calls or a constant like VOID_BLACK or PRODUCTS is edited. The bytecode
+    and literal constants of every code object visited are included too,
+    since a lambda has no source of its own: editing the 0.5 in
+    `.point(lambda p: int(p * 0.5))` changes the key.
+    """
+    module = globals()
+    seen, sources, constants, codes_seen = set(), {}, {}, []
+    pending = list(roots)
+    while pending:
+        obj = pending.pop()
+        if isinstance(obj, type):
+            pending.extend(v for v in vars(obj).values() if isinstance(v, types.FunctionType))
+            continue
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if obj.__name__ != "<lambda>":
+            sources[obj.__qualname__] = inspect.getsource(obj)
+        codes = [obj.__code__]
+        while codes:
+            code = codes.pop()
+            codes.extend(c for c in code.co_consts if isinstance(c, types.CodeType))
+            literals = [_const_key(c) for c in code.co_consts if not isinstance(c, types.CodeType)]
+            codes_seen.append([code.co_qualname, code.co_code.hex(), literals])
+            for name in code.co_names:
+                value = module.get(name)
+                if isinstance(value, types.FunctionType) and value.__module__ == __name__ \
+                        or isinstance(value, type) and value.__module__ == __name__:
+                    pending.append(value)
+                elif name in module and not callable(value) and not isinstance(value, types.ModuleType):
+                    constants[name] = repr(value)
+    return [sorted(sources.items()), sorted(constants.items()), sorted(codes_seen)]
+
+class LayerCache:
+    """Pipeline stage outputs persisted as raw pixel files for mmap reuse
+
+    Each stage is keyed by its name, parameters, the source of the functions
+    it runs (and everything they call), the module constants they read and
+    the key of the stage before it, so changing one parameter only
+    recomputes that stage and everything downstream. The RNG state after
+    each stage is stored alongside the pixels, so a cache hit leaves later
+    stages drawing exactly the numbers they would have drawn anyway.
+
+    Layers in a mode Pillow can map (RGBA, L) are used straight from the
+    mapping; those mappings stay open until close(). RGB layers are copied
+    out and their mapping closed at once.
+    """
+
+    MAPPED_MODES = ('L', 'RGBA', 'RGBX')
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self._maps = []
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def stage(self, upstream, name, params, fn, *code):
+        """Run fn() unless a layer for this key exists; returns (img, key)"""
+        payload = json.dumps([upstream, name, params, code_key(fn, *code)], sort_keys=True)
+        key = hashlib.sha256(payload.encode()).hexdigest()[:24]
+        if not self.cache_dir:
+            return fn(), key
+
+        raw_path = os.path.join(self.cache_dir, f"{name}-{key}.raw")
+        meta_path = os.path.join(self.cache_dir, f"{name}-{key}.json")
+
+        if os.path.exists(meta_path) and os.path.exists(raw_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            mode, size = meta["mode"], tuple(meta["size"])
+            with open(raw_path, 'rb') as f:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if mode in self.MAPPED_MODES:
+                img = Image.frombuffer(mode, size, buf, 'raw', mode, 0, 1)
+                self._maps.append(buf)
+            else:
+                img = Image.frombytes(mode, size, buf)
+                buf.close()
+            version, state, gauss = meta["rng"]
+            random.setstate((version, tuple(state), gauss))
+            self.hits += 1
+            return img, key
+
+        img = fn()
+        with open(raw_path + ".tmp", 'wb') as f:
+            f.write(img.tobytes())
+        with open(meta_path + ".tmp", 'w') as f:
+            json.dump({"mode": img.mode, "size": img.size, "rng": random.getstate()}, f)
+        os.replace(raw_path + ".tmp", raw_path)
+        os.replace(meta_path + ".tmp", meta_path)
+        return img, key
+
+    def close(self):
+        """Unmap the layers handed out; drop every image that uses them first"""
+        for buf in self._maps:
+            buf.close()
+        self._maps = []
+
+def render_static_layers(seed=42, cache=None, density=1, stamps=False, vignette_strength=0.32):
+    """Frame-invariant layers for the animated export, rendered once"""
+    cache = cache or LayerCache()
+    random.seed(seed)
+    key = f"seed:{seed}"
+
+    img, key = cache.stage(key, "base", {}, create_base, create_base)
+    img, key = cache.stage(key, "watermark", {"fonts": font_key(TECH_FONT)},
+                           lambda: add_watermark(img, TECH_FONT), add_watermark)
+    img, key = cache.stage(key, "scanlines", {}, lambda: add_scanlines(img.copy()), add_scanlines)
+
+    rain, key = cache.stage(key, "rain-layer", {"fonts": font_key(GEIST_MONO)},
+                            lambda: create_dense_matrix(WIDTH, HEIGHT, GEIST_MONO), create_dense_matrix)
+    rain2, key = cache.stage(key, "rain2-layer", {"fonts": font_key(MONO_FONT)},
+                             lambda: create_dense_matrix(WIDTH, HEIGHT, MONO_FONT).point(lambda p: int(p * 0.5)),
+                             create_dense_matrix)
+
+    # Commerce elements go on their own transparent layer so they stay above the rain
+    elements, key = cache.stage(key, "elements-layer",
+                                {"fonts": font_key(PIXEL_FONT, MONO_FONT), "density": density, "stamps": stamps},
+                                lambda: add_elements(Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0)),
+                                                     PIXEL_FONT, MONO_FONT, density,
+                                                     StampCache() if stamps else None),
+                                add_elements, draw_cart, draw_barcode, *STAMP_CODE)
+    mask, _ = cache.stage("", "vignette-mask", {"strength": vignette_strength},
+                          lambda: vignette_mask(strength=vignette_strength), vignette_mask)
+
+    return {
+        "base": img.convert('RGBA'),
+        "rain": rain,
+        "rain2": rain2,
+        "elements": elements,
+        "vignette": mask,
+    }
+
+def render_frame(layers, frame, frames, seed=42, glitch_intensity=0.85):
+    """Composite one animation frame, recomputing only the time-varying stages"""
+    random.seed(seed * 1000 + frame)
+
+    # Rain falls two screens per loop, the dimmer layer one, so both wrap seamlessly
+    rain = ImageChops.offset(layers["rain"], 0, 2 * frame * HEIGHT // frames)
+    rain2 = ImageChops.offset(layers["rain2"], 0, frame * HEIGHT // frames)
+
+    img = Image.alpha_composite(layers["base"], rain)
+    img = Image.alpha_composite(img, rain2)
+    img = Image.alpha_composite(img, layers["elements"]).convert('RGB')
+
+    img = add_glitch_bands(img, intensity=glitch_intensity)
+    img = chromatic_aberration(img, offset=2)
+    img = ImageChops.multiply(img, layers["vignette"])
+    img = polish(img)
+    return add_scanline_flicker(img)
+
+def save_animation(frames, out, fps=12):
+    """Encode frames as animated WebP, or APNG for a .png/.apng path"""
+    params = dict(save_all=True, append_images=frames[1:], duration=1000 // fps, loop=0)
+    if out.lower().endswith('.webp'):
+        frames[0].save(out, 'WEBP', quality=80, method=2, **params)
+    else:
+        frames[0].save(out, 'PNG', optimize=True, **params)
+
+def main(out=OUTPUT_PATH, seed=42, glitch_intensity=0.85, vignette_strength=0.32, cache_dir=None,
+         density=1, stamps=False):
+    cache = LayerCache(cache_dir)
+    random.seed(seed)  # Reproducibility
+    key = f"seed:{seed}"
     print("=" * 55)
     print("  CORRUPTED COMMERCE - Final Museum-Quality Masterpiece")
     print("=" * 55)
 
     print("  [1/10] Crafting void gradient base...")
-    img = create_base()
+    img, key = cache.stage(key, "base", {}, create_base, create_base)
 
     print("  [2/10] Embedding ghostly USELESS watermark...")
-    img = add_watermark(img, TECH_FONT)
+    img, key = cache.stage(key, "watermark", {"fonts": font_key(TECH_FONT)},
+                           lambda: add_watermark(img, TECH_FONT), add_watermark)
 
     print("  [3/10] Layering CRT scanlines...")
-    img = add_scanlines(img)
+    img, key = cache.stage(key, "scanlines", {}, lambda: add_scanlines(img.copy()), add_scanlines)
 
     print("  [4/10] Generating dense matrix rain...")
-    rain = create_dense_matrix(WIDTH, HEIGHT, GEIST_MONO)
-    img = Image.alpha_composite(img.convert('RGBA'), rain).convert('RGB')
+    img, key = cache.stage(key, "rain", {"fonts": font_key(GEIST_MONO)},
+                           lambda: Image.alpha_composite(img.convert('RGBA'),
+                                                         create_dense_matrix(WIDTH, HEIGHT, GEIST_MONO)).convert('RGB'),
+                           create_dense_matrix)
 
     print("  [5/10] Second matrix layer for depth...")
-    rain2 = create_dense_matrix(WIDTH, HEIGHT, MONO_FONT)
-    rain2 = rain2.point(lambda p: int(p * 0.5))  # Dimmer
-    img = Image.alpha_composite(img.convert('RGBA'), rain2).convert('RGB')
+    def second_rain():
+        rain2 = create_dense_matrix(WIDTH, HEIGHT, MONO_FONT)
+        rain2 = rain2.point(lambda p: int(p * 0.5))  # Dimmer
+        return Image.alpha_composite(img.convert('RGBA'), rain2).convert('RGB')
+    img, key = cache.stage(key, "rain2", {"fonts": font_key(MONO_FONT)}, second_rain, create_dense_matrix)
 
     print("  [6/10] Placing commerce elements...")
-    img = add_elements(img, PIXEL_FONT, MONO_FONT)
+    img, key = cache.stage(key, "elements", {"fonts": font_key(PIXEL_FONT, MONO_FONT), "density": density, "stamps": stamps},
+                           lambda: add_elements(img.copy(), PIXEL_FONT, MONO_FONT, density,
+                                                StampCache() if stamps else None),
+                           add_elements, draw_cart, draw_barcode, *STAMP_CODE)
 
     print("  [7/10] Applying glitch displacement...")
-    img = add_glitch_bands(img, intensity=0.85)
+    img, key = cache.stage(key, "glitch", {"intensity": glitch_intensity},
+                           lambda: add_glitch_bands(img, intensity=glitch_intensity), add_glitch_bands)
 
     print("  [8/10] Chromatic aberration...")
-    img = chromatic_aberration(img, offset=2)
+    img, key = cache.stage(key, "chromatic", {"offset": 2},
+                           lambda: chromatic_aberration(img, offset=2), chromatic_aberration)
 
     print("  [9/10] Vignette focus...")
-    img = vignette(img, strength=0.32)
+    img, key = cache.stage(key, "vignette", {"strength": vignette_strength},
+                           lambda: vignette(img.copy(), strength=vignette_strength), vignette)
 
     print("  [10/10] Final polish...")
-    img = polish(img)
+    img, key = cache.stage(key, "polish", {},
+                           lambda: add_scanline_flicker(polish(img)), polish, add_scanline_flicker)
 
-    # Top scanline overlay
-    draw = ImageDraw.Draw(img)
-    for y in range(0, HEIGHT, 3):
-        if random.random() > 0.72:
-            draw.line([(0, y), (WIDTH, y)], fill=(0, 0, 0))
-
-    out = "/home/matt/projects/useless-io/public/backdrop-art/useless-glitch-backdrop.png"
     img.save(out, "PNG", optimize=True)
 
     print("=" * 55)
     print(f"  Masterpiece saved: {out}")
     print(f"  Dimensions: {WIDTH}x{HEIGHT}")
+    if cache_dir:
+        print(f"  Layer cache: {cache.hits}/10 stages reused from {cache_dir}")
+    print("=" * 55)
+
+def main_animated(out=ANIMATION_PATH, frames=60, fps=12, cache_dir=None, density=1, stamps=False,
+                  seed=42, glitch_intensity=0.85, vignette_strength=0.32):
+    print("=" * 55)
+    print("  CORRUPTED COMMERCE - Animated Loop")
+    print("=" * 55)
+
+    start = time.perf_counter()
+    print("  [1/3] Rendering static layers...")
+    cache = LayerCache(cache_dir)
+    layers = render_static_layers(seed=seed, cache=cache, density=density, stamps=stamps,
+                                  vignette_strength=vignette_strength)
+    static_time = time.perf_counter() - start
+
+    print(f"  [2/3] Rendering {frames} frames...")
+    sequence = [render_frame(layers, i, frames, seed=seed, glitch_intensity=glitch_intensity)
+                for i in range(frames)]
+    del layers
+    cache.close()
+
+    print("  [3/3] Encoding...")
+    save_animation(sequence, out, fps=fps)
+
+    print("=" * 55)
+    print(f"  Animation saved: {out}")
+    print(f"  {frames} frames @ {fps}fps, {WIDTH}x{HEIGHT}")
+    print(f"  Static layers {static_time:.1f}s, total {time.perf_counter() - start:.1f}s")
     print("=" * 55)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Render the Corrupted Commerce backdrop")
+    parser.add_argument("--animate", action="store_true",
+                        help="export an animated WebP/APNG loop instead of the still PNG")
+    parser.add_argument("--frames", type=int, default=60, help="frames in the loop (default: 60)")
+    parser.add_argument("--fps", type=int, default=12, help="playback rate (default: 12)")
+    parser.add_argument("--out", help="output path (.png for the still; .webp or .png for animation)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default: 42)")
+    parser.add_argument("--glitch-intensity", type=float, default=0.85)
+    parser.add_argument("--vignette-strength", type=float, default=0.32)
+    parser.add_argument("--cache-dir", help="persist each stage as a raw layer here and reuse unchanged ones")
+    parser.add_argument("--density", type=float, default=1,
+                        help="multiply the number of carts and barcodes (default: 1)")
+    parser.add_argument("--stamps", action="store_true",
+                        help="blit carts and barcodes from cached sprites (much faster at high density)")
+    args = parser.parse_args()
+
+    if args.animate:
+        main_animated(args.out or ANIMATION_PATH, frames=args.frames, fps=args.fps, cache_dir=args.cache_dir,
+                      density=args.density, stamps=args.stamps, seed=args.seed,
+                      glitch_intensity=args.glitch_intensity, vignette_strength=args.vignette_strength)
+    else:
+        main(args.out or OUTPUT_PATH, seed=args.seed, glitch_intensity=args.glitch_intensity,
+             vignette_strength=args.vignette_strength, cache_dir=args.cache_dir,
+             density=args.density, stamps=args.stamps)